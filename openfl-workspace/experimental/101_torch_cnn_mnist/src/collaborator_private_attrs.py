@@ -1,67 +1,63 @@
 # Copyright (C) 2020-2023 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-from copy import deepcopy
+import os
 
 import torch
 import torchvision
+from torch.utils.data import Subset
+
+mnist_root = "./files/"
+mnist_raw_files = (
+    "train-images-idx3-ubyte",
+    "train-labels-idx1-ubyte",
+    "t10k-images-idx3-ubyte",
+    "t10k-labels-idx1-ubyte",
+)
+# Only ask torchvision to download (and verify) MNIST until the raw files are in place
+download = not all(
+    os.path.exists(os.path.join(mnist_root, "MNIST", "raw", raw_file))
+    for raw_file in mnist_raw_files
+)
 
+mnist_transform = torchvision.transforms.Compose(
+    [
+        torchvision.transforms.ToTensor(),
+        torchvision.transforms.Normalize((0.1307,), (0.3081,)),
+    ]
+)
 
 mnist_train = torchvision.datasets.MNIST(
-    "./files/",
+    mnist_root,
     train=True,
-    download=True,
-    transform=torchvision.transforms.Compose(
-        [
-            torchvision.transforms.ToTensor(),
-            torchvision.transforms.Normalize((0.1307,), (0.3081,)),
-        ]
-    ),
+    download=download,
+    transform=mnist_transform,
 )
 
 mnist_test = torchvision.datasets.MNIST(
-    "./files/",
+    mnist_root,
     train=False,
-    download=True,
-    transform=torchvision.transforms.Compose(
-        [
-            torchvision.transforms.ToTensor(),
-            torchvision.transforms.Normalize((0.1307,), (0.3081,)),
-        ]
-    ),
+    download=download,
+    transform=mnist_transform,
 )
 
 
 n_collaborators = 2
 batch_size = 32
 
-train = deepcopy(mnist_train)
-test = deepcopy(mnist_test)
-
-train.data = mnist_train.data[0::n_collaborators]
-train.targets = mnist_train.targets[0::n_collaborators]
-test.data = mnist_test.data[0::n_collaborators]
-test.targets = mnist_test.targets[0::n_collaborators]
+# Subset only keeps the shard indices, the underlying tensors are shared
+col1_train = Subset(mnist_train, range(0, len(mnist_train), n_collaborators))
+col1_test = Subset(mnist_test, range(0, len(mnist_test), n_collaborators))
 
 col1_private_attributes = {
-    "train_loader": torch.utils.data.DataLoader(
-        train, batch_size=batch_size, shuffle=True
-    ),
-    "test_loader": torch.utils.data.DataLoader(
-        test, batch_size=batch_size, shuffle=True
-    ),
+    "train_loader": torch.utils.data.DataLoader(col1_train, batch_size=batch_size, shuffle=True),
+    "test_loader": torch.utils.data.DataLoader(col1_test, batch_size=batch_size, shuffle=True),
 }
 
-train.data = mnist_train.data[1::n_collaborators]
-train.targets = mnist_train.targets[1::n_collaborators]
-test.data = mnist_test.data[1::n_collaborators]
-test.targets = mnist_test.targets[1::n_collaborators]
+col2_train = Subset(mnist_train, range(1, len(mnist_train), n_collaborators))
+col2_test = Subset(mnist_test, range(1, len(mnist_test), n_collaborators))
 
 col2_private_attributes = {
-    "train_loader": torch.utils.data.DataLoader(
-        train, batch_size=batch_size, shuffle=True
-    ),
-    "test_loader": torch.utils.data.DataLoader(
-        test, batch_size=batch_size, shuffle=True
-    ),
+    "train_loader": torch.utils.data.DataLoader(col2_train, batch_size=batch_size, shuffle=True),
+    "test_loader": torch.utils.data.DataLoader(col2_test, batch_size=batch_size, shuffle=True),
 }
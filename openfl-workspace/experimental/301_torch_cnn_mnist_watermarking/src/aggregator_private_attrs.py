@@ -1,17 +1,17 @@
 # Copyright (C) 2020-2023 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-import torch
-import torchvision
-import numpy as np
-import pathlib
 import os
+import pathlib
+
+import imagen as ig
 import matplotlib
 import matplotlib.pyplot as plt
-import PIL.Image as Image
-import imagen as ig
 import numbergen as ng
-
+import numpy as np
+import PIL.Image as Image
+import torch
+import torchvision
 
 watermark_dir = "./files/watermark-dataset/MWAFFLE/"
 
@@ -78,8 +78,8 @@ def generate_watermark(
         for i in range(num_samples_per_class):
             base = np.random.rand(x_size, y_size)
             base[
-                x_offset: x_offset + pat.shape[0],
-                y_offset: y_offset + pat.shape[1],
+                x_offset : x_offset + pat.shape[0],
+                y_offset : y_offset + pat.shape[1],
             ] += pat
             d = np.ones((x_size, x_size))
             img = np.minimum(base, d)
@@ -95,9 +95,7 @@ def generate_watermark(
 # If the Watermark dataset does not exist, generate and save the Watermark images
 watermark_path = pathlib.Path(watermark_dir)
 if watermark_path.exists() and watermark_path.is_dir():
-    print(
-        f"Watermark dataset already exists at: {watermark_path}. Proceeding to next step ... "
-    )
+    print(f"Watermark dataset already exists at: {watermark_path}. Proceeding to next step ... ")
     pass
 else:
     print("Generating Watermark dataset... ")
@@ -107,9 +105,7 @@ else:
 class WatermarkDataset(torch.utils.data.Dataset):
     def __init__(self, images_dir, label_dir=None, transforms=None):
         self.images_dir = os.path.abspath(images_dir)
-        self.image_paths = [
-            os.path.join(self.images_dir, d) for d in os.listdir(self.images_dir)
-        ]
+        self.image_paths = [os.path.join(self.images_dir, d) for d in os.listdir(self.images_dir)]
         self.label_paths = label_dir
         self.transform = transforms
         temp = []
@@ -127,15 +123,24 @@ class WatermarkDataset(torch.utils.data.Dataset):
         if len(self.image_paths) == 0:
             raise Exception(f"No file(s) found under {images_dir}")
 
+        self.labels = [int(image_path.split("/")[-2]) for image_path in self.image_paths]
+        # Decoded images are cached, the watermark set is re-read for every pretrain/retrain epoch
+        self._images = {}
+
     def __len__(self):
         return len(self.image_paths)
 
+    def _load_image(self, idx):
+        image = self._images.get(idx)
+        if image is None:
+            with Image.open(self.image_paths[idx]) as image_file:
+                image = image_file.convert("RGB")
+            self._images[idx] = image
+        return image
+
     def __getitem__(self, idx):
-        image_filepath = self.image_paths[idx]
-        image = Image.open(image_filepath)
-        image = image.convert("RGB")
-        image = self.transform(image)
-        label = int(image_filepath.split("/")[-2])
+        image = self.transform(self._load_image(idx))
+        label = self.labels[idx]
 
         return image, label
 
@@ -157,10 +162,25 @@ watermark_data = WatermarkDataset(
 )
 
 
-def aggregator_private_attrs(watermark_data, batch_size):
+def aggregator_private_attrs(watermark_data, batch_size, num_workers=2):
+    loader_kwargs = {"num_workers": num_workers}
+    if num_workers > 0:
+        loader_kwargs["persistent_workers"] = True
     return {
         "watermark_data_loader": torch.utils.data.DataLoader(
-            watermark_data, batch_size=batch_size, shuffle=True
+            watermark_data,
+            batch_size=batch_size,
+            shuffle=True,
+            pin_memory=torch.cuda.is_available(),
+            **loader_kwargs,
+        ),
+        # The watermark accuracy decides when retraining stops, so it is
+        # measured on every image exactly once
+        "watermark_validation_data_loader": torch.utils.data.DataLoader(
+            watermark_data,
+            batch_size=batch_size,
+            pin_memory=torch.cuda.is_available(),
+            **loader_kwargs,
         ),
         "pretrain_epochs": 25,
         "retrain_epochs": 25,
@@ -1,45 +1,72 @@
 # Copyright (C) 2020-2023 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-from copy import deepcopy
+import os
 
 import torch
 import torchvision
+from torch.utils.data import Subset
+
+mnist_root = "./files/"
+mnist_raw_files = (
+    "train-images-idx3-ubyte",
+    "train-labels-idx1-ubyte",
+    "t10k-images-idx3-ubyte",
+    "t10k-labels-idx1-ubyte",
+)
+# Only ask torchvision to download (and verify) MNIST until the raw files are in place
+download = not all(
+    os.path.exists(os.path.join(mnist_root, "MNIST", "raw", raw_file))
+    for raw_file in mnist_raw_files
+)
+
+mnist_transform = torchvision.transforms.Compose(
+    [
+        torchvision.transforms.ToTensor(),
+        torchvision.transforms.Normalize((0.1307,), (0.3081,)),
+    ]
+)
 
 train_dataset = torchvision.datasets.MNIST(
-    "./files/",
+    mnist_root,
     train=True,
-    download=True,
-    transform=torchvision.transforms.Compose(
-        [
-            torchvision.transforms.ToTensor(),
-            torchvision.transforms.Normalize((0.1307,), (0.3081,)),
-        ]
-    ),
+    download=download,
+    transform=mnist_transform,
 )
 
 test_dataset = torchvision.datasets.MNIST(
-    "./files/",
+    mnist_root,
     train=False,
-    download=True,
-    transform=torchvision.transforms.Compose(
-        [
-            torchvision.transforms.ToTensor(),
-            torchvision.transforms.Normalize((0.1307,), (0.3081,)),
-        ]
-    ),
+    download=download,
+    transform=mnist_transform,
 )
 
 
-def collaborator_private_attrs(index, n_collaborators, batch_size, train_dataset, test_dataset):
-    train = deepcopy(train_dataset)
-    test = deepcopy(test_dataset)
-    train.data = train_dataset.data[index::n_collaborators]
-    train.targets = train_dataset.targets[index::n_collaborators]
-    test.data = test_dataset.data[index::n_collaborators]
-    test.targets = test_dataset.targets[index::n_collaborators]
+def collaborator_private_attrs(
+    index,
+    n_collaborators,
+    batch_size,
+    train_dataset,
+    test_dataset,
+    num_workers=min(4, os.cpu_count() or 1),
+    prefetch_factor=4,
+):
+    # Subset only keeps the shard indices, the underlying tensors are shared
+    train = Subset(train_dataset, range(index, len(train_dataset), n_collaborators))
+    test = Subset(test_dataset, range(index, len(test_dataset), n_collaborators))
+
+    loader_kwargs = {
+        "batch_size": batch_size,
+        "shuffle": True,
+        "pin_memory": torch.cuda.is_available(),
+        "num_workers": num_workers,
+    }
+    if num_workers > 0:
+        # Lower prefetch_factor on memory-constrained envoys, pinned batches add up
+        loader_kwargs["persistent_workers"] = True
+        loader_kwargs["prefetch_factor"] = prefetch_factor
 
     return {
-        "train_loader": torch.utils.data.DataLoader(train, batch_size=batch_size, shuffle=True),
-        "test_loader": torch.utils.data.DataLoader(test, batch_size=batch_size, shuffle=True),
+        "train_loader": torch.utils.data.DataLoader(train, **loader_kwargs),
+        "test_loader": torch.utils.data.DataLoader(test, **loader_kwargs),
     }
@@ -1,14 +1,13 @@
 # Copyright (C) 2020-2023 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-from openfl.experimental.interface import FLSpec
-from openfl.experimental.placement import aggregator, collaborator
-
+import torch
 import torch.nn as nn
 import torch.nn.functional as F
 import torch.optim as optim
-import torch
-import numpy as np
+
+from openfl.experimental.interface import FLSpec
+from openfl.experimental.placement import aggregator, collaborator
 
 # MNIST parameters
 learning_rate = 5e-2
@@ -21,49 +20,102 @@ watermark_pretrain_momentum = 5e-1
 watermark_pretrain_weight_decay = 5e-05
 watermark_retrain_learning_rate = 5e-3
 
+# Models train on the GPU when there is one, so pinned batches are copied asynchronously
+device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+# Let cuDNN pick the fastest (NHWC) convolution algorithms for the fixed input shape
+torch.backends.cudnn.benchmark = True
+
+# Mixed precision on GPU: bf16 needs no loss scaling, fp16 is paired with a GradScaler
+amp_dtype = (
+    torch.bfloat16
+    if torch.cuda.is_available() and torch.cuda.is_bf16_supported()
+    else torch.float16
+)
+
+
+def make_grad_scaler(model):
+    # Each optimizer gets its own scaler, the scale adapts to its own gradients.
+    # None when the model trains without fp16 autocast and needs no loss scaling
+    if next(model.parameters()).device.type == "cuda" and amp_dtype == torch.float16:
+        return torch.amp.GradScaler("cuda")
+    return None
+
 
 def inference(network, test_loader):
     network.eval()
-    correct = 0
-    with torch.no_grad():
+    device = next(network.parameters()).device
+    # Accumulate on the device, the host only syncs once after the loop
+    correct = torch.zeros((), dtype=torch.long, device=device)
+    with torch.inference_mode():
         for data, target in test_loader:
-            output = network(data)
+            data = data.to(device, non_blocking=True, memory_format=torch.channels_last)
+            target = target.to(device, non_blocking=True)
+            with torch.autocast(device.type, dtype=amp_dtype, enabled=device.type == "cuda"):
+                output = network(data)
             pred = output.data.max(1, keepdim=True)[1]
-            correct += pred.eq(target.data.view_as(pred)).sum()
-    accuracy = float(correct / len(test_loader.dataset))
+            correct.add_(pred.eq(target.view_as(pred)).sum())
+    accuracy = correct.item() / len(test_loader.dataset)
     return accuracy
 
 
-def train_model(model, optimizer, data_loader, entity, round_number, log=False):
+def train_model(model, optimizer, data_loader, entity, round_number, log=False, grad_scaler=None):
     # Helper function to train the model
-    train_loss = 0
     model.train()
+    device = next(model.parameters()).device
+    # Summed on the device, so the loop does not sync with the host every step
+    train_loss = torch.zeros((), device=device)
+    use_amp = device.type == "cuda"
     for batch_idx, (X, y) in enumerate(data_loader):
-        optimizer.zero_grad()
-
-        output = model(X)
-        loss = F.nll_loss(output, y)
-        loss.backward()
-
-        optimizer.step()
-
-        train_loss += loss.item() * len(X)
-        if batch_idx % log_interval == 0 and log:
-            print(f"{entity:<20} Train Epoch: {round_number:<3}"
-                  + f" [{batch_idx * len(X):<3}/{len(data_loader.dataset):<4}"
-                  + f" ({100.0 * batch_idx / len(data_loader):<.0f}%)]"
-                  + f" Loss: {loss.item():<.6f}")
-    train_loss /= len(data_loader.dataset)
-    return train_loss
+        X = X.to(device, non_blocking=True, memory_format=torch.channels_last)
+        y = y.to(device, non_blocking=True)
+        optimizer.zero_grad(set_to_none=True)
+
+        with torch.autocast(device.type, dtype=amp_dtype, enabled=use_amp):
+            output = model(X)
+            loss = F.cross_entropy(output, y)
+        if grad_scaler is None:
+            loss.backward()
+            optimizer.step()
+        else:
+            grad_scaler.scale(loss).backward()
+            grad_scaler.step(optimizer)
+            grad_scaler.update()
+
+        train_loss.add_(loss.detach(), alpha=len(X))
+        if log and batch_idx % log_interval == 0:
+            print(
+                f"{entity:<20} Train Epoch: {round_number:<3}"
+                + f" [{batch_idx * len(X):<3}/{len(data_loader.dataset):<4}"
+                + f" ({100.0 * batch_idx / len(data_loader):<.0f}%)]"
+                + f" Loss: {loss.item():<.6f}"
+            )
+    return train_loss.item() / len(data_loader.dataset)
 
 
 def fedavg(agg_model, models):
-    state_dicts = [model.state_dict() for model in models]
+    # Running sum: peak memory stays at two models instead of stacking all of them
     state_dict = agg_model.state_dict()
-    for key in models[0].state_dict():
-        state_dict[key] = np.sum(
-            np.array([state[key] for state in state_dicts], dtype=object),
-            axis=0) / len(models)
+    keys = list(state_dict)
+    # state_dict() builds a new OrderedDict on every call, fetch each one once
+    state_dicts = [model.state_dict() for model in models]
+    agg_tensors = [state_dicts[0][key].float().clone() for key in keys]
+    for model_state in state_dicts[1:]:
+        tensors = [model_state[key].float() for key in keys]
+        if hasattr(torch, "_foreach_add_"):
+            # One fused multi-tensor kernel per model instead of one per key
+            torch._foreach_add_(agg_tensors, tensors)
+        else:
+            for agg_tensor, tensor in zip(agg_tensors, tensors):
+                agg_tensor.add_(tensor)
+    if hasattr(torch, "_foreach_div_"):
+        torch._foreach_div_(agg_tensors, len(models))
+    else:
+        for agg_tensor in agg_tensors:
+            agg_tensor.div_(len(models))
+    for key, agg_tensor in zip(keys, agg_tensors):
+        # Cast back so integer buffers (e.g. BatchNorm counters) keep their dtype
+        state_dict[key] = agg_tensor.to(state_dict[key].dtype)
     agg_model.load_state_dict(state_dict)
     return agg_model
 
@@ -86,16 +138,18 @@ class Net(nn.Module):
         self.fc2 = nn.Linear(200, 10)
         self.relu = nn.ReLU()
         self.dropout = nn.Dropout(p=dropout)
+        self.to(memory_format=torch.channels_last)
 
     def forward(self, x):
         x = self.dropout(x)
         out = self.block(x)
-        out = out.view(-1, 128 * 5**2)
+        # flatten() instead of view(), channels_last activations are not contiguous
+        out = torch.flatten(out, 1)
         out = self.dropout(out)
         out = self.relu(self.fc1(out))
         out = self.dropout(out)
         out = self.fc2(out)
-        return F.log_softmax(out, 1)
+        return out
 
 
 class FederatedFlow_MNIST_Watermarking(FLSpec):  # NOQA N801
@@ -112,6 +166,7 @@ class FederatedFlow_MNIST_Watermarking(FLSpec):  # NOQA N801
         watermark_retrain_optimizer=None,
         round_number=0,
         n_rounds=4,
+        compile_model=False,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -122,10 +177,9 @@ class FederatedFlow_MNIST_Watermarking(FLSpec):  # NOQA N801
             self.watermark_pretrain_optimizer = watermark_pretrain_optimizer
             self.watermark_retrain_optimizer = watermark_retrain_optimizer
         else:
-            self.model = Net()
-            self.optimizer = optim.SGD(
-                self.model.parameters(), lr=learning_rate, momentum=momentum
-            )
+            # Moved before the optimizers are built, so their state lives on the device too
+            self.model = Net().to(device)
+            self.optimizer = optim.SGD(self.model.parameters(), lr=learning_rate, momentum=momentum)
             self.watermark_pretrain_optimizer = optim.SGD(
                 self.model.parameters(),
                 lr=watermark_pretrain_learning_rate,
@@ -135,6 +189,20 @@ class FederatedFlow_MNIST_Watermarking(FLSpec):  # NOQA N801
             self.watermark_retrain_optimizer = optim.SGD(
                 self.model.parameters(), lr=watermark_retrain_learning_rate
             )
+        if compile_model and hasattr(self.model, "compile"):
+            # Opt-in: compiling takes a while and needs a C compiler, eager is the default.
+            # In-place nn.Module.compile() keeps state_dict keys and picklability intact
+            self.model.compile(
+                mode=(
+                    "reduce-overhead"
+                    if next(self.model.parameters()).device.type == "cuda"
+                    else "default"
+                ),
+                fullgraph=True,
+            )
+        self.grad_scaler = make_grad_scaler(self.model)
+        self.watermark_pretrain_grad_scaler = make_grad_scaler(self.model)
+        self.watermark_retrain_grad_scaler = make_grad_scaler(self.model)
         self.round_number = round_number
         self.n_rounds = n_rounds
 
@@ -166,14 +234,17 @@ class FederatedFlow_MNIST_Watermarking(FLSpec):  # NOQA N801
                     "<Agg>:",
                     i,
                     log=False,
+                    grad_scaler=self.watermark_pretrain_grad_scaler,
                 )
                 watermark_pretrain_validation_score = inference(
-                    self.model, self.watermark_data_loader
+                    self.model, self.watermark_validation_data_loader
                 )
 
-                print(f"<Agg>: Watermark Pretraining: Round: {i:<3}"
-                      + f" Loss: {watermark_pretrain_loss:<.6f}"
-                      + f" Acc: {watermark_pretrain_validation_score:<.6f}")
+                print(
+                    f"<Agg>: Watermark Pretraining: Round: {i:<3}"
+                    + f" Loss: {watermark_pretrain_loss:<.6f}"
+                    + f" Acc: {watermark_pretrain_validation_score:<.6f}"
+                )
 
             self.watermark_pretraining_completed = True
 
@@ -188,9 +259,10 @@ class FederatedFlow_MNIST_Watermarking(FLSpec):  # NOQA N801
         Perform Aggregated Model validation on Collaborators.
         """
         self.agg_validation_score = inference(self.model, self.test_loader)
-        print(f"<Collab: {self.input}>"
-              + f" Aggregated Model validation score = {self.agg_validation_score}"
-              )
+        print(
+            f"<Collab: {self.input}>"
+            + f" Aggregated Model validation score = {self.agg_validation_score}"
+        )
 
         self.next(self.train)
 
@@ -201,9 +273,8 @@ class FederatedFlow_MNIST_Watermarking(FLSpec):  # NOQA N801
         """
         print("<Collab>: Performing Model Training on Local dataset ... ")
 
-        self.optimizer = optim.SGD(
-            self.model.parameters(), lr=learning_rate, momentum=momentum
-        )
+        self.optimizer = optim.SGD(self.model.parameters(), lr=learning_rate, momentum=momentum)
+        self.grad_scaler = make_grad_scaler(self.model)
 
         self.loss = train_model(
             self.model,
@@ -212,6 +283,7 @@ class FederatedFlow_MNIST_Watermarking(FLSpec):  # NOQA N801
             f"<Collab: {self.input}>",
             self.round_number,
             log=True,
+            grad_scaler=self.grad_scaler,
         )
 
         self.next(self.local_model_validation)
@@ -233,18 +305,16 @@ class FederatedFlow_MNIST_Watermarking(FLSpec):  # NOQA N801
         Model aggregation step.
         """
         self.average_loss = sum(input.loss for input in inputs) / len(inputs)
-        self.aggregated_model_accuracy = sum(
-            input.agg_validation_score for input in inputs
-        ) / len(inputs)
-        self.local_model_accuracy = sum(
-            input.local_validation_score for input in inputs
-        ) / len(inputs)
+        self.aggregated_model_accuracy = sum(input.agg_validation_score for input in inputs) / len(
+            inputs
+        )
+        self.local_model_accuracy = sum(input.local_validation_score for input in inputs) / len(
+            inputs
+        )
 
         print("<Agg>: Joining models from collaborators...")
 
-        print(
-            f"   Aggregated model validation score = {self.aggregated_model_accuracy}"
-        )
+        print(f"   Aggregated model validation score = {self.aggregated_model_accuracy}")
         print(f"   Average training loss = {self.average_loss}")
         print(f"   Average local model validation values = {self.local_model_accuracy}")
 
@@ -261,17 +331,18 @@ class FederatedFlow_MNIST_Watermarking(FLSpec):  # NOQA N801
         self.watermark_retrain_optimizer = optim.SGD(
             self.model.parameters(), lr=watermark_retrain_learning_rate
         )
+        self.watermark_retrain_grad_scaler = make_grad_scaler(self.model)
 
         retrain_round = 0
 
         # Perform re-training until (accuracy >= acc_threshold) or
         # (retrain_round > number of retrain_epochs)
         self.watermark_retrain_validation_score = inference(
-            self.model, self.watermark_data_loader
+            self.model, self.watermark_validation_data_loader
         )
-        while (
-            self.watermark_retrain_validation_score < self.watermark_acc_threshold
-        ) and (retrain_round < self.retrain_epochs):
+        while (self.watermark_retrain_validation_score < self.watermark_acc_threshold) and (
+            retrain_round < self.retrain_epochs
+        ):
             self.watermark_retrain_train_loss = train_model(
                 self.model,
                 self.watermark_retrain_optimizer,
@@ -279,15 +350,18 @@ class FederatedFlow_MNIST_Watermarking(FLSpec):  # NOQA N801
                 "<Agg>",
                 retrain_round,
                 log=False,
+                grad_scaler=self.watermark_retrain_grad_scaler,
             )
             self.watermark_retrain_validation_score = inference(
-                self.model, self.watermark_data_loader
+                self.model, self.watermark_validation_data_loader
             )
 
-            print(f"<Agg>: Watermark Retraining: Train Epoch: {self.round_number:<3}"
-                  + f" Retrain Round: {retrain_round:<3}"
-                  + f" Loss: {self.watermark_retrain_train_loss:<.6f},"
-                  + f" Acc: {self.watermark_retrain_validation_score:<.6f}")
+            print(
+                f"<Agg>: Watermark Retraining: Train Epoch: {self.round_number:<3}"
+                + f" Retrain Round: {retrain_round:<3}"
+                + f" Loss: {self.watermark_retrain_train_loss:<.6f},"
+                + f" Acc: {self.watermark_retrain_validation_score:<.6f}"
+            )
             retrain_round += 1
 
         if self.round_number < self.n_rounds:
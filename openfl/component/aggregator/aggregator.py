@@ -34,6 +34,9 @@ class Aggregator:
         federation_uuid (str): Federation UUID.
         assigner: Object assigning tasks to collaborators.
         quit_job_sent_to (list): Collaborators sent a quit job.
+        quit_job_sent_callback (Callable): Called without arguments once quit
+            jobs are sent to all the collaborators, from the thread sending
+            the last one. None if nobody waits for it.
         tensor_db (TensorDB): Object for tensor database.
         db_store_rounds* (int): Rounds to store in TensorDB.
         logger: Object for logging.
@@ -76,6 +79,7 @@ class Aggregator:
         db_store_rounds=1,
         write_logs=False,
         log_metric_callback=None,
+        quit_job_sent_callback=None,
         **kwargs,
     ):
         """Initializes the Aggregator.
@@ -105,6 +109,8 @@ class Aggregator:
                 False.
             log_metric_callback (optional): Callback for log metric. Defaults
                 to None.
+            quit_job_sent_callback (Callable, optional): Callback invoked once
+                quit jobs are sent to all the collaborators. Defaults to None.
             **kwargs: Additional keyword arguments.
         """
         self.round_number = 0
@@ -131,6 +137,7 @@ class Aggregator:
         self.federation_uuid = federation_uuid
         self.assigner = assigner
         self.quit_job_sent_to = []
+        self.quit_job_sent_callback = quit_job_sent_callback
 
         self.tensor_db = TensorDB()
         # FIXME: I think next line generates an error on the second round
@@ -347,6 +354,8 @@ class Aggregator:
                 collaborator_name,
             )
             self.quit_job_sent_to.append(collaborator_name)
+            if self.all_quit_jobs_sent():
+                self._notify_quit_job_sent()
 
             tasks = None
             sleep_time = 0
@@ -1060,6 +1069,12 @@ class Aggregator:
                 collaborator_name,
             )
             self.quit_job_sent_to.append(collaborator_name)
+        self._notify_quit_job_sent()
+
+    def _notify_quit_job_sent(self):
+        """Invoke the quit job sent callback if anyone waits for it."""
+        if self.quit_job_sent_callback is not None:
+            self.quit_job_sent_callback()
 
 
 the_dragon = """
@@ -11,6 +11,8 @@ from collections import defaultdict
 from pathlib import Path
 from typing import Callable, Iterable, List, Union
 
+import numpy as np
+
 from openfl.component.director.experiment import Experiment, ExperimentsRegistry, Status
 from openfl.transport.grpc.exceptions import ShardNotFoundError
 
@@ -35,11 +37,28 @@ class Director:
             in seconds.
         install_requirements (bool): A flag indicating if the requirements
             should be installed.
+        dispatch_buffer_size (int): The number of envoys notified about a new
+            experiment at once.
+        dispatch_buffer_interval (float): The delay between notifying two
+            buffers of envoys in seconds.
         _shard_registry (dict): A dictionary to store the shard registry.
+        _envoy_index (dict): A dictionary mapping envoy names to their rows
+            in the envoy liveness arrays.
+        _envoy_last_updated (np.ndarray): Monotonic time of the last health
+            check of each envoy.
+        _envoy_online (np.ndarray): Online flag of each envoy.
+        _envoy_running (np.ndarray): Flag of each envoy running an
+            experiment.
+        _envoys_generation (int): A counter bumped whenever the envoys'
+            statuses may have changed.
+        _envoys_online_until (float): Monotonic time at which the first
+            envoy reported online misses its health checks.
         experiments_registry (ExperimentsRegistry): An object of
             ExperimentsRegistry to store the experiments.
-        col_exp_queues (defaultdict): A defaultdict to store the experiment
-            queues for collaborators.
+        col_exp_events (defaultdict): A defaultdict to store the events
+            signaling collaborators that a new experiment is pending.
+        col_exp_pending (dict): A dictionary to store the names of the
+            experiments pending for collaborators.
         col_exp (dict): A dictionary to store the experiments for
             collaborators.
         logger (Logger): A logger for logging activities.
@@ -57,6 +76,8 @@ class Director:
         review_plan_callback: Union[None, Callable] = None,
         envoy_health_check_period: int = 60,
         install_requirements: bool = False,
+        dispatch_buffer_size: int = 0,
+        dispatch_buffer_interval: float = 1.0,
     ) -> None:
         """Initialize the Director object.
 
@@ -79,19 +100,35 @@ class Director:
                 check of envoys in seconds. Defaults to 60.
             install_requirements (bool, optional): A flag indicating if the
                 requirements should be installed. Defaults to False.
+            dispatch_buffer_size (int, optional): The number of envoys
+                notified about a new experiment at once. Envoys download the
+                experiment archive as soon as they are notified, so buffers
+                spread the downloads over time. 0 notifies all the envoys at
+                once. Defaults to 0.
+            dispatch_buffer_interval (float, optional): The delay between
+                notifying two buffers of envoys in seconds. Defaults to 1.0.
         """
         self.sample_shape, self.target_shape = sample_shape, target_shape
         self._shard_registry = {}
+        self._envoy_index = {}
+        self._envoy_last_updated = np.empty(0, dtype=np.float64)
+        self._envoy_online = np.empty(0, dtype=bool)
+        self._envoy_running = np.empty(0, dtype=bool)
+        self._envoys_generation = 0
+        self._envoys_online_until = float("inf")
         self.tls = tls
         self.root_certificate = root_certificate
         self.private_key = private_key
         self.certificate = certificate
         self.experiments_registry = ExperimentsRegistry()
-        self.col_exp_queues = defaultdict(asyncio.Queue)
+        self.col_exp_events = defaultdict(asyncio.Event)
+        self.col_exp_pending = {}
         self.col_exp = {}
         self.review_plan_callback = review_plan_callback
         self.envoy_health_check_period = envoy_health_check_period
         self.install_requirements = install_requirements
+        self.dispatch_buffer_size = dispatch_buffer_size
+        self.dispatch_buffer_interval = dispatch_buffer_interval
 
     def acknowledge_shard(self, shard_info: dict) -> bool:
         """Save shard info to shard registry if it's acceptable.
@@ -115,16 +152,46 @@ class Director:
             )
             return is_accepted
         logger.info("Director accepted shard for %s", shard_info["node_info"]["name"])
-        self._shard_registry[shard_info["node_info"]["name"]] = {
-            "shard_info": shard_info,
-            "is_online": True,
-            "is_experiment_running": False,
-            "valid_duration": 2 * self.envoy_health_check_period,
-            "last_updated": time.time(),
-        }
+        envoy_name = shard_info["node_info"]["name"]
+        envoy_info = self._shard_registry.get(envoy_name)
+        if envoy_info is None:
+            self._shard_registry[envoy_name] = {"shard_info": shard_info}
+        else:
+            # Reconnecting envoy: its registry entry and liveness row are reused
+            envoy_info["shard_info"] = shard_info
+        row = self._get_envoy_row(envoy_name)
+        self._envoy_online[row] = True
+        self._envoy_running[row] = False
+        self._envoy_last_updated[row] = time.monotonic()
+        self._envoys_generation += 1
         is_accepted = True
         return is_accepted
 
+    def _get_envoy_row(self, envoy_name: str) -> int:
+        """Get the row of the envoy in the liveness arrays.
+
+        A new row is allocated for an unknown envoy, growing the arrays by
+        doubling their capacity when they are full.
+
+        Args:
+            envoy_name (str): String id for envoy.
+
+        Returns:
+            int: Index of the envoy in the liveness arrays.
+        """
+        row = self._envoy_index.get(envoy_name)
+        if row is not None:
+            return row
+        row = len(self._envoy_index)
+        capacity = len(self._envoy_last_updated)
+        if row == capacity:
+            new_capacity = max(2 * capacity, 8)
+            self._envoy_last_updated = np.resize(self._envoy_last_updated, new_capacity)
+            self._envoy_online = np.resize(self._envoy_online, new_capacity)
+            self._envoy_running = np.resize(self._envoy_running, new_capacity)
+        self._envoy_index[envoy_name] = row
+        return row
+
     async def set_new_experiment(
         self,
         *,
@@ -149,7 +216,7 @@ class Director:
         experiment = Experiment(
             name=experiment_name,
             archive_path=experiment_archive_path,
-            collaborators=list(collaborator_names),
+            collaborators=collaborator_names,
             users=[sender_name],
             sender=sender_name,
             init_tensor_dict=tensor_dict,
@@ -234,20 +301,27 @@ class Director:
             envoy_name (str): The name of the envoy.
 
         Returns:
-            str: The name of the experiment on the queue.
+            str: The name of the experiment pending for the envoy.
         """
         experiment_name = self.col_exp.get(envoy_name)
-        if experiment_name and experiment_name in self.experiments_registry:
+        experiment = self.experiments_registry.get(experiment_name) if experiment_name else None
+        if experiment is not None and experiment.status in (Status.PENDING, Status.IN_PROGRESS):
             # Experiment already set, but the envoy hasn't received experiment
-            # name (e.g. was disconnected)
-            experiment = self.experiments_registry[experiment_name]
-            if experiment.aggregator.round_number < experiment.aggregator.rounds_to_train:
+            # name (e.g. was disconnected). The aggregator of a running
+            # experiment may still be being created.
+            aggregator = experiment.aggregator
+            if aggregator is None or aggregator.round_number < aggregator.rounds_to_train:
                 return experiment_name
 
         self.col_exp[envoy_name] = None
-        queue = self.col_exp_queues[envoy_name]
-        experiment_name = await queue.get()
+        self._envoys_generation += 1
+        event = self.col_exp_events[envoy_name]
+        while envoy_name not in self.col_exp_pending:
+            await event.wait()
+            event.clear()
+        experiment_name = self.col_exp_pending.pop(envoy_name)
         self.col_exp[envoy_name] = experiment_name
+        self._envoys_generation += 1
 
         return experiment_name
 
@@ -286,9 +360,9 @@ class Director:
                 f" does not have access to this experiment"
             )
 
-        while not self.experiments_registry[experiment_name].aggregator:
-            await asyncio.sleep(1)
-        aggregator = self.experiments_registry[experiment_name].aggregator
+        experiment = self.experiments_registry[experiment_name]
+        await experiment.aggregator_created.wait()
+        aggregator = experiment.aggregator
 
         while True:
             if not aggregator.metric_queue.empty():
@@ -368,10 +442,11 @@ class Director:
         if not shard_info:
             raise ShardNotFoundError(f"Unknown shard {envoy_name}")
 
-        shard_info["is_online"]: True
-        shard_info["is_experiment_running"] = is_experiment_running
-        shard_info["valid_duration"] = 2 * self.envoy_health_check_period
-        shard_info["last_updated"] = time.time()
+        row = self._envoy_index[envoy_name]
+        self._envoy_online[row] = True
+        self._envoy_running[row] = is_experiment_running
+        self._envoy_last_updated[row] = time.monotonic()
+        self._envoys_generation += 1
 
         if cuda_devices_status is not None:
             for i in range(len(cuda_devices_status)):
@@ -386,15 +461,44 @@ class Director:
             list: List with the status information about envoys.
         """
         logger.debug("Shard registry: %s", self._shard_registry)
-        for envoy_info in self._shard_registry.values():
-            envoy_info["is_online"] = time.time() < envoy_info.get(
-                "last_updated", 0
-            ) + envoy_info.get("valid_duration", 0)
-            envoy_name = envoy_info["shard_info"]["node_info"]["name"]
+        valid_duration = 2 * self.envoy_health_check_period
+        n_envoys = len(self._envoy_index)
+        last_updated = self._envoy_last_updated[:n_envoys]
+        now = time.monotonic()
+        # One vectorized sweep marks every envoy that missed its health checks
+        online_until = last_updated + valid_duration
+        self._envoy_online[:n_envoys] &= now < online_until
+        self._envoys_online_until = online_until[self._envoy_online[:n_envoys]].min(
+            initial=float("inf")
+        )
+        # Envoys report wall-clock timestamps
+        last_updated = last_updated + (time.time() - now)
+
+        for envoy_name, row in self._envoy_index.items():
+            envoy_info = self._shard_registry[envoy_name]
+            envoy_info["is_online"] = bool(self._envoy_online[row])
+            envoy_info["is_experiment_running"] = bool(self._envoy_running[row])
+            envoy_info["valid_duration"] = valid_duration
+            envoy_info["last_updated"] = float(last_updated[row])
             envoy_info["experiment_name"] = self.col_exp[envoy_name]
 
         return self._shard_registry.values()
 
+    def get_envoys_generation(self) -> int:
+        """Get a counter that changes whenever the envoys' statuses may change.
+
+        Besides registrations, health checks and experiment assignments, the
+        counter also changes once an envoy reported online by get_envoys
+        misses its health checks.
+
+        Returns:
+            int: The generation of the envoys' statuses.
+        """
+        if time.monotonic() >= self._envoys_online_until:
+            self._envoys_generation += 1
+            self._envoys_online_until = float("inf")
+        return self._envoys_generation
+
     def get_experiments_list(self, caller: str) -> list:
         """Get experiments list for specific user.
 
@@ -457,19 +561,18 @@ class Director:
 
     async def start_experiment_execution_loop(self):
         """Run task to monitor and run experiments."""
-        loop = asyncio.get_event_loop()
         while True:
             async with self.experiments_registry.get_next_experiment() as experiment:
                 # Review experiment block starts.
                 if self.review_plan_callback:
                     if not await experiment.review_experiment(self.review_plan_callback):
                         logger.info(
-                            f'"{experiment.name}" Plan was rejected by the Director manager.'
+                            '"%s" Plan was rejected by the Director manager.', experiment.name
                         )
                         continue
                 # Review experiment block ends.
 
-                run_aggregator_future = loop.create_task(
+                run_aggregator_future = asyncio.create_task(
                     experiment.start(
                         root_certificate=self.root_certificate,
                         certificate=self.certificate,
@@ -478,10 +581,18 @@ class Director:
                         install_requirements=self.install_requirements,
                     )
                 )
-                # Adding the experiment to collaborators queues
-                for col_name in experiment.collaborators:
-                    queue = self.col_exp_queues[col_name]
-                    await queue.put(experiment.name)
+                # Notifying collaborators about the experiment in buffers of
+                # dispatch_buffer_size, dispatch_buffer_interval apart
+                collaborators = experiment.collaborators
+                buffer_size = self.dispatch_buffer_size or len(collaborators) or 1
+                col_exp_events = self.col_exp_events
+                for start in range(0, len(collaborators), buffer_size):
+                    buffer = collaborators[start : start + buffer_size]
+                    self.col_exp_pending.update(dict.fromkeys(buffer, experiment.name))
+                    for col_name in buffer:
+                        col_exp_events[col_name].set()
+                    if start + buffer_size < len(collaborators):
+                        await asyncio.sleep(self.dispatch_buffer_interval)
                 await run_aggregator_future
 
 
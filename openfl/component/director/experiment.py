@@ -6,9 +6,11 @@
 
 import asyncio
 import logging
+from collections import defaultdict, deque
 from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
-from typing import Callable, Iterable, List, Union
+from typing import Callable, Deque, Iterable, List, Union
 
 from openfl.federated import Plan
 from openfl.transport import AggregatorGRPCServer
@@ -34,23 +36,39 @@ class Experiment:
             name (str): The name of the experiment.
             archive_path (Union[Path, str]): The path to the experiment
                 archive.
-            collaborators (List[str]): The list of collaborators.
+            collaborators (Tuple[str, ...]): The collaborators.
             sender (str): The name of the sender.
             init_tensor_dict (dict): The initial tensor dictionary.
             plan_path (Union[Path, str]): The path to the plan.
             users (Iterable[str]): The list of users.
             status (str): The status of the experiment.
             aggregator (object): The aggregator object.
+            aggregator_created (asyncio.Event): The event set once the
+                aggregator object is created.
             run_aggregator_atask (object): The run aggregator async task
                 object.
     """
 
+    __slots__ = (
+        "name",
+        "archive_path",
+        "collaborators",
+        "sender",
+        "init_tensor_dict",
+        "plan_path",
+        "users",
+        "status",
+        "aggregator",
+        "aggregator_created",
+        "run_aggregator_atask",
+    )
+
     def __init__(
         self,
         *,
         name: str,
         archive_path: Union[Path, str],
-        collaborators: List[str],
+        collaborators: Iterable[str],
         sender: str,
         init_tensor_dict: dict,
         plan_path: Union[Path, str] = "plan/plan.yaml",
@@ -62,7 +80,7 @@ class Experiment:
             name (str): The name of the experiment.
             archive_path (Union[Path, str]): The path to the experiment
                 archive.
-            collaborators (List[str]): The list of collaborators.
+            collaborators (Iterable[str]): The collaborators.
             sender (str): The name of the sender.
             init_tensor_dict (dict): The initial tensor dictionary.
             plan_path (Union[Path, str], optional): The path to the plan.
@@ -71,14 +89,17 @@ class Experiment:
                 None.
         """
         self.name = name
-        self.archive_path = Path(archive_path).absolute()
-        self.collaborators = collaborators
+        archive_path = Path(archive_path)
+        # The director passes absolute paths, which need no getcwd() call
+        self.archive_path = archive_path if archive_path.is_absolute() else archive_path.absolute()
+        self.collaborators = tuple(collaborators)
         self.sender = sender
         self.init_tensor_dict = init_tensor_dict
         self.plan_path = Path(plan_path)
         self.users = set() if users is None else set(users)
         self.status = Status.PENDING
         self.aggregator = None
+        self.aggregator_created = asyncio.Event()
         self.run_aggregator_atask = None
 
     async def start(
@@ -106,7 +127,7 @@ class Experiment:
         """
         self.status = Status.IN_PROGRESS
         try:
-            logger.info(f"New experiment {self.name} for " f"collaborators {self.collaborators}")
+            logger.info("New experiment %s for collaborators %s", self.name, self.collaborators)
 
             with ExperimentWorkspace(
                 experiment_name=self.name,
@@ -120,6 +141,7 @@ class Experiment:
                     certificate=certificate,
                 )
                 self.aggregator = aggregator_grpc_server.aggregator
+                self.aggregator_created.set()
 
                 self.run_aggregator_atask = asyncio.create_task(
                     self._run_aggregator_grpc_server(
@@ -186,8 +208,8 @@ class Experiment:
         Returns:
             AggregatorGRPCServer: The created aggregator gRPC server.
         """
-        plan = Plan.parse(plan_config_path=self.plan_path)
-        plan.authorized_cols = list(self.collaborators)
+        plan = Plan.parse_cached(self.plan_path)
+        plan.authorized_cols = self.collaborators
 
         logger.info("🧿 Created an Aggregator Server for %s experiment.", self.name)
         aggregator_grpc_server = plan.interactive_api_get_server(
@@ -210,32 +232,63 @@ class Experiment:
                 server to run.
         """
         logger.info("🧿 Starting the Aggregator Service.")
+        loop = asyncio.get_running_loop()
+        aggregator = aggregator_grpc_server.aggregator
+        # The aggregator runs in gRPC worker threads, which hand the event
+        # over to the loop instead of occupying an executor thread
+        quit_job_sent = asyncio.Event()
+        aggregator.quit_job_sent_callback = partial(loop.call_soon_threadsafe, quit_job_sent.set)
         grpc_server = aggregator_grpc_server.get_server()
-        grpc_server.start()
+        # Binding the port and spinning up the server threads blocks
+        await loop.run_in_executor(None, grpc_server.start)
         logger.info("Starting Aggregator gRPC Server")
 
         try:
-            while not aggregator_grpc_server.aggregator.all_quit_jobs_sent():
-                # Awaiting quit job sent to collaborators
-                await asyncio.sleep(10)
+            # Awaiting quit job sent to collaborators
+            await quit_job_sent.wait()
             logger.debug("Aggregator sent quit jobs calls to all collaborators")
         except KeyboardInterrupt:
             pass
         finally:
             grpc_server.stop(0)
+            # Nothing may be scheduled on the loop once the experiment is over
+            aggregator.quit_job_sent_callback = None
             # Temporary solution to free RAM used by TensorDB
-            aggregator_grpc_server.aggregator.tensor_db.clean_up(0)
+            aggregator.tensor_db.clean_up(0)
 
 
 class ExperimentsRegistry:
     """ExperimentsList class."""
 
-    def __init__(self) -> None:
-        """Initialize an experiments list object."""
+    __slots__ = (
+        "__active_experiment_name",
+        "__pending_experiments",
+        "__archived_experiments",
+        "__pending_names",
+        "__archived_names",
+        "__dict",
+        "__experiment_added",
+        "__user_experiments",
+    )
+
+    def __init__(self, max_archived_experiments: int = 1024) -> None:
+        """Initialize an experiments list object.
+
+        Args:
+            max_archived_experiments (int, optional): The number of finished
+                experiments to keep. The oldest ones are dropped from the
+                registry. Defaults to 1024.
+        """
         self.__active_experiment_name = None
-        self.__pending_experiments = []
-        self.__archived_experiments = []
+        self.__pending_experiments = deque()
+        self.__archived_experiments = deque(maxlen=max_archived_experiments)
+        # Sets mirror the ordered lists above for O(1) membership checks
+        self.__pending_names = set()
+        self.__archived_names = set()
         self.__dict = {}
+        self.__experiment_added = asyncio.Event()
+        # user -> names of the user's experiments (dict keeps registration order)
+        self.__user_experiments = defaultdict(dict)
 
     @property
     def active_experiment(self) -> Union[Experiment, None]:
@@ -250,11 +303,11 @@ class ExperimentsRegistry:
         return self.__dict[self.__active_experiment_name]
 
     @property
-    def pending_experiments(self) -> List[str]:
+    def pending_experiments(self) -> Deque[str]:
         """Get queue of not started experiments.
 
         Returns:
-            List[str]: The list of pending experiments.
+            Deque[str]: The queue of pending experiments.
         """
         return self.__pending_experiments
 
@@ -264,8 +317,14 @@ class ExperimentsRegistry:
         Args:
            experiment (Experiment): The experiment to add.
         """
+        if experiment.name in self.__dict:
+            self._remove_from_user_index(self.__dict[experiment.name])
         self.__dict[experiment.name] = experiment
+        for user in experiment.users:
+            self.__user_experiments[user][experiment.name] = None
         self.__pending_experiments.append(experiment.name)
+        self.__pending_names.add(experiment.name)
+        self.__experiment_added.set()
 
     def remove(self, name: str) -> None:
         """Remove experiment from everywhere.
@@ -275,12 +334,28 @@ class ExperimentsRegistry:
         """
         if self.__active_experiment_name == name:
             self.__active_experiment_name = None
-        if name in self.__pending_experiments:
+        if name in self.__pending_names:
+            self.__pending_names.discard(name)
             self.__pending_experiments.remove(name)
-        if name in self.__archived_experiments:
+        if name in self.__archived_names:
+            self.__archived_names.discard(name)
             self.__archived_experiments.remove(name)
         if name in self.__dict:
-            del self.__dict[name]
+            self._remove_from_user_index(self.__dict.pop(name))
+
+    def _remove_from_user_index(self, experiment: Experiment) -> None:
+        """Remove experiment from the users index.
+
+        Args:
+            experiment (Experiment): The experiment to remove.
+        """
+        for user in experiment.users:
+            user_experiments = self.__user_experiments.get(user)
+            if user_experiments is None:
+                continue
+            user_experiments.pop(experiment.name, None)
+            if not user_experiments:
+                del self.__user_experiments[user]
 
     def __getitem__(self, key: str) -> Experiment:
         """Get experiment by name.
@@ -316,7 +391,7 @@ class ExperimentsRegistry:
         Returns:
             List[Experiment]: The list of experiments for the specific user.
         """
-        return [exp for exp in self.__dict.values() if user in exp.users]
+        return [self.__dict[name] for name in self.__user_experiments.get(user, ())]
 
     def __contains__(self, key: str) -> bool:
         """Check if experiment exists.
@@ -331,8 +406,28 @@ class ExperimentsRegistry:
 
     def finish_active(self) -> None:
         """Finish active experiment."""
-        self.__archived_experiments.insert(0, self.__active_experiment_name)
+        archived = self.__archived_experiments
+        if len(archived) == archived.maxlen:
+            self._evict_archived(archived.pop())
+        archived.appendleft(self.__active_experiment_name)
+        self.__archived_names.add(self.__active_experiment_name)
         self.__active_experiment_name = None
+        if self.__pending_experiments:
+            self.__experiment_added.set()
+
+    def _evict_archived(self, name: str) -> None:
+        """Drop the experiment evicted from the archive.
+
+        Args:
+            name (str): The name of the evicted experiment.
+        """
+        self.__archived_names.discard(name)
+        # The name may have been submitted again in the meantime
+        if name in self.__pending_names or name == self.__active_experiment_name:
+            return
+        experiment = self.__dict.pop(name, None)
+        if experiment is not None:
+            self._remove_from_user_index(experiment)
 
     @asynccontextmanager
     async def get_next_experiment(self):
@@ -341,13 +436,13 @@ class ExperimentsRegistry:
         On enter get experiment from pending_experiments. On exit put finished
         experiment to archive_experiments.
         """
-        while True:
-            if self.active_experiment is None and self.pending_experiments:
-                break
-            await asyncio.sleep(10)
+        while self.active_experiment is not None or not self.pending_experiments:
+            self.__experiment_added.clear()
+            await self.__experiment_added.wait()
 
         try:
-            self.__active_experiment_name = self.pending_experiments.pop(0)
+            self.__active_experiment_name = self.pending_experiments.popleft()
+            self.__pending_names.discard(self.__active_experiment_name)
             yield self.active_experiment
         finally:
             self.finish_active()
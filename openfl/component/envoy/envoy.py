@@ -5,10 +5,13 @@
 """Envoy module."""
 
 import logging
+import os
+import random
+import signal
 import sys
-import time
+import tempfile
+import threading
 import traceback
-import uuid
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Callable, Optional, Type, Union
@@ -22,7 +25,51 @@ from openfl.utilities.workspace import ExperimentWorkspace
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_RETRY_TIMEOUT_IN_SECONDS = 5
+DATA_FILE_BUFFER_SIZE = 4 * 1024 * 1024
+DATA_FILE_WRITE_BATCH_SIZE = 16
+MAX_IN_MEMORY_DATA_FILE_SIZE = 64 * 1024 * 1024
+MAX_RETRY_TIMEOUT_IN_SECONDS = 60
+MIN_HEALTH_CHECK_PERIOD_IN_SECONDS = 0.5
+
+
+class _Backoff:
+    """Exponential backoff with jitter for retrying director calls.
+
+    Attributes:
+        base (float): The delay of the first retry in seconds.
+        cap (float): The maximum delay in seconds.
+        attempt (int): The number of retries since the last reset.
+    """
+
+    def __init__(self, base: float = 0.5, cap: float = MAX_RETRY_TIMEOUT_IN_SECONDS) -> None:
+        """Initialize a backoff object.
+
+        Args:
+            base (float, optional): The delay of the first retry in seconds.
+                Defaults to 0.5.
+            cap (float, optional): The maximum delay in seconds. Defaults to
+                MAX_RETRY_TIMEOUT_IN_SECONDS.
+        """
+        self.base = base
+        self.cap = cap
+        self.attempt = 0
+
+    def next(self) -> float:
+        """Get the delay before the next retry.
+
+        Returns:
+            float: The delay in seconds, randomized within its upper half so
+                that envoys do not retry in lockstep.
+        """
+        delay = min(self.cap, self.base * 2**self.attempt)
+        # The delay has already reached the cap, stop growing the exponent
+        if delay < self.cap:
+            self.attempt += 1
+        return delay * (0.5 + random.random() / 2)  # nosec
+
+    def reset(self) -> None:
+        """Reset the backoff after a successful call."""
+        self.attempt = 0
 
 
 class Envoy:
@@ -44,12 +91,15 @@ class Envoy:
             reviewing the plan.
         cuda_device_monitor (Optional[Type[CUDADeviceMonitor]]): The CUDA
             device monitor.
-        executor (ThreadPoolExecutor): The executor for running tasks.
+        executor (ThreadPoolExecutor): The executor running the health
+            checks.
         running_experiments (dict): A dictionary to store the running
             experiments.
         is_experiment_running (bool): A flag indicating if an experiment is
             running.
         _health_check_future (object): The future object for the health check.
+        _shutdown_event (threading.Event): The event set when the envoy is
+            stopped.
     """
 
     def __init__(
@@ -67,6 +117,8 @@ class Envoy:
         cuda_devices: Union[tuple, list] = (),
         cuda_device_monitor: Optional[Type[CUDADeviceMonitor]] = None,
         review_plan_callback: Union[None, Callable] = None,
+        channel_options: Optional[list] = None,
+        pool_size: int = 1,
     ) -> None:
         """Initialize a envoy object.
 
@@ -91,13 +143,16 @@ class Envoy:
                 The CUDA device monitor. Defaults to None.
             review_plan_callback (Union[None, Callable], optional): A callback
                 function for reviewing the plan. Defaults to None.
+            channel_options (Optional[list], optional): The gRPC options of
+                the channel to the director. Defaults to None, meaning the
+                options tuned for streaming experiment data.
+            pool_size (int, optional): The number of connections to the
+                director. Defaults to 1.
         """
         self.name = shard_name
-        self.root_certificate = (
-            Path(root_certificate).absolute() if root_certificate is not None else None
-        )
-        self.private_key = Path(private_key).absolute() if root_certificate is not None else None
-        self.certificate = Path(certificate).absolute() if root_certificate is not None else None
+        self.root_certificate = _absolute_path(root_certificate)
+        self.private_key = _absolute_path(private_key)
+        self.certificate = _absolute_path(certificate)
         self.director_client = ShardDirectorClient(
             director_host=director_host,
             director_port=director_port,
@@ -106,6 +161,8 @@ class Envoy:
             root_certificate=root_certificate,
             private_key=private_key,
             certificate=certificate,
+            options=channel_options,
+            pool_size=pool_size,
         )
 
         self.shard_descriptor = shard_descriptor
@@ -117,29 +174,35 @@ class Envoy:
         # Optional plugins
         self.cuda_device_monitor = cuda_device_monitor
 
-        self.executor = ThreadPoolExecutor()
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"envoy-health-check-{shard_name}"
+        )
         self.running_experiments = {}
         self.is_experiment_running = False
         self._health_check_future = None
+        self._shutdown_event = threading.Event()
 
     def run(self):
         """Run of the envoy working cycle."""
-        while True:
+        backoff = _Backoff()
+        while not self._shutdown_event.is_set():
             try:
                 # Workspace import should not be done by gRPC client!
                 experiment_name = self.director_client.wait_experiment()
                 data_stream = self.director_client.get_experiment_data(experiment_name)
+                data_size = self.director_client.get_experiment_data_size(data_stream)
             except Exception as exc:
                 logger.exception("Failed to get experiment: %s", exc)
-                time.sleep(DEFAULT_RETRY_TIMEOUT_IN_SECONDS)
+                self._shutdown_event.wait(backoff.next())
                 continue
+            backoff.reset()
 
-            data_file_path = self._save_data_stream_to_file(data_stream)
+            data_file = self._save_data_stream_to_file(data_stream, data_size)
 
             try:
                 with ExperimentWorkspace(
                     experiment_name=f"{self.name}_{experiment_name}",
-                    data_file_path=data_file_path,
+                    data_file=data_file,
                     install_requirements=self.install_requirements,
                 ):
                     # If the callback is passed
@@ -153,7 +216,7 @@ class Envoy:
                             )
                             continue
                         logger.debug(
-                            f'Experiment "{experiment_name}" was accepted by Envoy manager'
+                            'Experiment "%s" was accepted by Envoy manager', experiment_name
                         )
                     self.is_experiment_running = True
                     self._run_collaborator()
@@ -168,30 +231,81 @@ class Envoy:
                 self.is_experiment_running = False
 
     @staticmethod
-    def _save_data_stream_to_file(data_stream):
+    def _save_data_stream_to_file(data_stream, data_size=None):
         """Save data stream to file.
 
+        The file is kept in memory unless the archive is larger than
+        MAX_IN_MEMORY_DATA_FILE_SIZE, in which case it rolls over to an
+        anonymous temporary file on disk.
+
         Args:
             data_stream: The data stream to save.
+            data_size (int, optional): The total size of the data, if known.
+                Defaults to None.
 
         Returns:
-            Path: The path to the saved data file.
+            tempfile.SpooledTemporaryFile: The saved data file.
         """
-        data_file_path = Path(str(uuid.uuid4())).absolute()
-        with open(data_file_path, "wb") as data_file:
-            for response in data_stream:
-                if response.size == len(response.npbytes):
-                    data_file.write(response.npbytes)
-                else:
-                    raise Exception("Broken archive")
-        return data_file_path
+        # A large write buffer coalesces the small stream chunks into few
+        # writes once the file is on disk
+        data_file = tempfile.SpooledTemporaryFile(
+            max_size=MAX_IN_MEMORY_DATA_FILE_SIZE, buffering=DATA_FILE_BUFFER_SIZE
+        )
+        try:
+            on_disk = data_size is not None and data_size > MAX_IN_MEMORY_DATA_FILE_SIZE
+            if on_disk:
+                _preallocate(data_file, data_size)
+            if on_disk and hasattr(os, "writev"):
+                # Large archives go to disk: batches of chunks are written
+                # straight to the file with one vectored write each
+                chunks_per_write = DATA_FILE_WRITE_BATCH_SIZE
+                fd = data_file.fileno()
+
+                def write_chunks(chunks):
+                    _write_vectored(fd, chunks)
+
+            else:
+                chunks_per_write = 1
+
+                def write_chunks(chunks):
+                    data_file.write(chunks[0])
+
+            # Chunks are written by a separate thread, so receiving the next
+            # chunks from the network overlaps with writing the previous ones
+            with ThreadPoolExecutor(max_workers=1) as writer:
+                pending_write = None
+                chunks = []
+                for response in data_stream:
+                    # A memoryview lets the chunk be checked and written
+                    # without copying the payload
+                    chunk = memoryview(response.npbytes)
+                    if response.size != chunk.nbytes:
+                        raise Exception("Broken archive")
+                    chunks.append(chunk)
+                    if len(chunks) < chunks_per_write:
+                        continue
+                    if pending_write is not None:
+                        pending_write.result()
+                    pending_write = writer.submit(write_chunks, chunks)
+                    chunks = []
+                if pending_write is not None:
+                    pending_write.result()
+                if chunks:
+                    write_chunks(chunks)
+            if data_size is not None and data_file.tell() != data_size:
+                raise Exception("Broken archive")
+        except BaseException:
+            data_file.close()
+            raise
+        return data_file
 
     def send_health_check(self):
         """Send health check to the director."""
         logger.debug("Sending envoy node status to director.")
-        timeout = DEFAULT_RETRY_TIMEOUT_IN_SECONDS
-        while True:
+        backoff = _Backoff()
+        while not self._shutdown_event.is_set():
             cuda_devices_info = self._get_cuda_device_info()
+            timeout = None
             try:
                 timeout = self.director_client.send_health_check(
                     envoy_name=self.name,
@@ -204,7 +318,14 @@ class Envoy:
                     shard_descriptor=self.shard_descriptor,
                     cuda_devices=self.cuda_devices,
                 )
-            time.sleep(timeout)
+            # The client returns no period when the health check has failed
+            if timeout is None:
+                self._shutdown_event.wait(backoff.next())
+                continue
+            backoff.reset()
+            # A misconfigured director must not make the envoy flood it with
+            # health checks
+            self._shutdown_event.wait(max(MIN_HEALTH_CHECK_PERIOD_IN_SECONDS, timeout))
 
     def _get_cuda_device_info(self):
         """Get CUDA device info.
@@ -237,7 +358,7 @@ class Envoy:
                     )
         except Exception as exc:
             logger.exception(
-                f"Failed to get cuda device info: {exc}. " f"Check your cuda device monitor plugin."
+                "Failed to get cuda device info: %s. Check your cuda device monitor plugin.", exc
             )
         return cuda_devices_info
 
@@ -247,7 +368,7 @@ class Envoy:
         Args:
             plan (str, optional): The path to the plan. Defaults to 'plan/plan.yaml'.
         """
-        plan = Plan.parse(plan_config_path=Path(plan))
+        plan = Plan.parse_cached(Path(plan))
 
         # TODO: Need to restructure data loader config file loader
         logger.debug("Data = %s", plan.cols_data_paths)
@@ -263,8 +384,28 @@ class Envoy:
         col.set_available_devices(cuda=self.cuda_devices)
         col.run()
 
+    def stop(self):
+        """Stop the envoy working cycle and the health checks."""
+        self._shutdown_event.set()
+
+    def _handle_sigterm(self, signum, frame):
+        """Stop the envoy on SIGTERM.
+
+        Exiting through SystemExit lets the running experiment workspace
+        clean up after itself.
+
+        Args:
+            signum (int): The signal number.
+            frame (frame): The current stack frame.
+        """
+        logger.info("Envoy received SIGTERM, shutting down")
+        self.stop()
+        sys.exit(0)
+
     def start(self):
         """Start the envoy."""
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._handle_sigterm)
         try:
             is_accepted = self.director_client.report_shard_info(
                 shard_descriptor=self.shard_descriptor,
@@ -283,3 +424,55 @@ class Envoy:
                 # Shut down
                 logger.error("Report shard info was not accepted")
                 sys.exit(1)
+
+
+def _preallocate(data_file: tempfile.SpooledTemporaryFile, size: int) -> None:
+    """Move the data file to disk and allocate its blocks in one go.
+
+    Allocating the whole file up front lets the filesystem lay it out
+    contiguously instead of extending it chunk by chunk.
+
+    Args:
+        data_file (tempfile.SpooledTemporaryFile): The data file.
+        size (int): The size of the data in bytes.
+    """
+    data_file.rollover()
+    if not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(data_file.fileno(), 0, size)
+    except OSError as exc:
+        logger.debug("Could not preallocate the data file: %s", exc)
+
+
+def _write_vectored(fd: int, chunks: list) -> None:
+    """Write the chunks to a file descriptor with vectored writes.
+
+    Args:
+        fd (int): The file descriptor.
+        chunks (list): The memoryviews to write, in order.
+    """
+    chunks = list(chunks)
+    while chunks:
+        written = os.writev(fd, chunks)
+        # Drop the chunks written in full and retry the rest of a partly
+        # written one
+        while chunks and written >= chunks[0].nbytes:
+            written -= chunks.pop(0).nbytes
+        if written:
+            chunks[0] = chunks[0][written:]
+
+
+def _absolute_path(path: Optional[Union[Path, str]]) -> Optional[Path]:
+    """Get the absolute path if a path is given.
+
+    Args:
+        path (Optional[Union[Path, str]]): The path.
+
+    Returns:
+        Optional[Path]: The absolute path, or None if no path is given.
+    """
+    if path is None:
+        return None
+    path = Path(path)
+    return path if path.is_absolute() else path.absolute()
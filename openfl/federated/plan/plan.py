@@ -3,13 +3,22 @@
 
 
 """Plan module."""
-from hashlib import sha384
+from copy import copy, deepcopy
+from functools import lru_cache
+from hashlib import sha256, sha384
 from importlib import import_module
 from logging import getLogger
 from os.path import splitext
 from pathlib import Path
 
-from yaml import SafeDumper, dump, safe_load
+from yaml import SafeDumper, dump
+from yaml import load as load_yaml
+
+try:
+    # LibYAML bindings parse plans much faster than the pure Python loader
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 from openfl.component.assigner.custom_assigner import Assigner
 from openfl.interface.aggregation_functions import AggregationFunction, WeightedAverage
@@ -65,7 +74,7 @@ class Plan:
         if default is None:
             default = {}
         if yaml_path and yaml_path.exists():
-            return safe_load(yaml_path.read_text())
+            return load_yaml(yaml_path.read_text(), Loader=SafeLoader)
         return default
 
     @staticmethod
@@ -206,6 +215,28 @@ class Plan:
             )
             raise
 
+    @staticmethod
+    def parse_cached(plan_config_path: Path):
+        """Parse the Federated Learning plan, reusing an earlier parse of the
+        same plan file content.
+
+        Building components mutates the plan config and caches the components
+        on the plan, so each call returns a private copy of the cached plan.
+
+        Args:
+            plan_config_path (Path): The filepath to the Federated Learning
+                plan.
+
+        Returns:
+            Plan: A Federated Learning plan object.
+        """
+        plan_digest = sha256(plan_config_path.read_bytes()).hexdigest()
+        plan = copy(_parse_plan(str(plan_config_path), plan_digest))
+        plan.config = deepcopy(plan.config)
+        plan.authorized_cols = list(plan.authorized_cols)
+        plan.cols_data_paths = dict(plan.cols_data_paths)
+        return plan
+
     @staticmethod
     def build(template, settings, **override):
         """Create an instance of a openfl Component or Federated
@@ -786,3 +817,20 @@ class Plan:
             return None
         obj = serializer_plugin.restore_object(filename)
         return obj
+
+
+@lru_cache(maxsize=32)
+def _parse_plan(plan_config_path: str, plan_digest: str) -> Plan:
+    """Parse a plan once per plan file content.
+
+    Experiments are extracted into fresh workspaces, so the plan file content
+    (not its modification time) identifies an already parsed plan.
+
+    Args:
+        plan_config_path (str): The filepath to the Federated Learning plan.
+        plan_digest (str): The digest of the plan file content.
+
+    Returns:
+        Plan: The parsed plan.
+    """
+    return Plan.parse(plan_config_path=Path(plan_config_path))
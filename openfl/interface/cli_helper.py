@@ -6,6 +6,7 @@
 import os
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from itertools import islice
 from os import environ, stat
 from pathlib import Path
@@ -203,6 +204,29 @@ def copytree(
     return _copytree()
 
 
+def copy_template_files(template_dir, destination, names):
+    """Copy workspace template files.
+
+    Several files are copied concurrently to hide the round trips of remote
+    filesystems.
+
+    Args:
+        template_dir (Path): The directory of the template files.
+        destination (Path): The directory to copy the files to.
+        names (Sequence[str]): The names of the files to copy.
+    """
+    if len(names) == 1:
+        shutil.copyfile(template_dir / names[0], destination / names[0])
+        return
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        copies = [
+            executor.submit(shutil.copyfile, template_dir / name, destination / name)
+            for name in names
+        ]
+        for copy in copies:
+            copy.result()
+
+
 def get_workspace_parameter(name):
     """Get a parameter from the workspace config file (.workspace).
 
@@ -15,8 +15,12 @@ from dynaconf import Validator
 
 from openfl.component.director import Director
 from openfl.interface.cli import review_plan_callback
-from openfl.interface.cli_helper import WORKSPACE
+from openfl.interface.cli_helper import WORKSPACE, copy_template_files
 from openfl.transport import DirectorGRPCServer
+from openfl.transport.grpc.director_server import (
+    EXPERIMENT_DATA_CHUNK_SIZE,
+    MAX_EXPERIMENT_DATA_CHUNK_SIZE,
+)
 from openfl.utilities import merge_configs
 from openfl.utilities.path_check import is_directory_traversal
 
@@ -111,6 +115,18 @@ def start(director_config_path, tls, root_certificate, private_key, certificate)
                 lte=24 * 60 * 60,
             ),
             Validator("settings.review_experiment", default=False),
+            Validator("settings.dispatch_buffer_size", default=0, gte=0),
+            Validator(
+                "settings.dispatch_buffer_interval",
+                default=1.0,  # in seconds
+                gte=0,
+            ),
+            Validator(
+                "settings.experiment_data_chunk_size",
+                default=EXPERIMENT_DATA_CHUNK_SIZE,  # in bytes
+                gte=1,
+                lte=MAX_EXPERIMENT_DATA_CHUNK_SIZE,
+            ),
         ],
         value_transform=[
             ("settings.sample_shape", lambda x: list(map(str, x))),
@@ -138,6 +154,16 @@ def start(director_config_path, tls, root_certificate, private_key, certificate)
     if config.settings.review_experiment:
         overwritten_review_plan_callback = review_plan_callback
 
+    # The event loop policy has to be set before the director creates its
+    # asyncio primitives
+    try:
+        import uvloop
+
+        uvloop.install()
+        logger.debug("Using uvloop event loop")
+    except ImportError:
+        pass
+
     director_server = DirectorGRPCServer(
         director_cls=Director,
         tls=tls,
@@ -151,6 +177,9 @@ def start(director_config_path, tls, root_certificate, private_key, certificate)
         review_plan_callback=overwritten_review_plan_callback,
         envoy_health_check_period=config.settings.envoy_health_check_period,
         install_requirements=config.settings.install_requirements,
+        dispatch_buffer_size=config.settings.dispatch_buffer_size,
+        dispatch_buffer_interval=config.settings.dispatch_buffer_interval,
+        experiment_data_chunk_size=config.settings.experiment_data_chunk_size,
     )
     director_server.start()
 
@@ -179,4 +208,4 @@ def create(director_path):
         shutil.rmtree(director_path)
     (director_path / "cert").mkdir(parents=True, exist_ok=True)
     (director_path / "logs").mkdir(parents=True, exist_ok=True)
-    shutil.copyfile(WORKSPACE / "default/director.yaml", director_path / "director.yaml")
+    copy_template_files(WORKSPACE / "default", director_path, ("director.yaml",))
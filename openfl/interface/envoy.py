@@ -14,9 +14,8 @@ from click import Path as ClickPath
 from click import group, option, pass_context
 from dynaconf import Validator
 
-from openfl.component.envoy.envoy import Envoy
 from openfl.interface.cli import review_plan_callback
-from openfl.interface.cli_helper import WORKSPACE
+from openfl.interface.cli_helper import WORKSPACE, copy_template_files
 from openfl.utilities import click_types, merge_configs
 from openfl.utilities.path_check import is_directory_traversal
 
@@ -109,6 +108,9 @@ def start_(
         private_key (str): Path to a private key.
         certificate (str): Path to a signed certificate.
     """
+    # The envoy pulls in the whole component and transport stack, so it is
+    # imported here rather than every time the CLI loads its command groups
+    from openfl.component.envoy.envoy import Envoy
 
     logger.info("🧿 Starting the Envoy.")
     if is_directory_traversal(envoy_config_path):
@@ -198,15 +200,11 @@ def create(envoy_path):
     (envoy_path / "cert").mkdir(parents=True, exist_ok=True)
     (envoy_path / "logs").mkdir(parents=True, exist_ok=True)
     (envoy_path / "data").mkdir(parents=True, exist_ok=True)
-    shutil.copyfile(
-        WORKSPACE / "default/envoy_config.yaml",
-        envoy_path / "envoy_config.yaml",
+    copy_template_files(
+        WORKSPACE / "default",
+        envoy_path,
+        ("envoy_config.yaml", "shard_descriptor.py", "requirements.txt"),
     )
-    shutil.copyfile(
-        WORKSPACE / "default/shard_descriptor.py",
-        envoy_path / "shard_descriptor.py",
-    )
-    shutil.copyfile(WORKSPACE / "default/requirements.txt", envoy_path / "requirements.txt")
 
 
 def shard_descriptor_from_config(shard_config: dict):
@@ -12,6 +12,7 @@ from os import getcwd, makedirs
 from os.path import basename
 from pathlib import Path
 from shutil import copytree, ignore_patterns, make_archive
+from threading import Thread
 from typing import Dict, Tuple
 
 from tensorboardX import SummaryWriter
@@ -27,6 +28,18 @@ from openfl.utilities.utils import rmtree
 from openfl.utilities.workspace import dump_requirements_file
 
 
+def _remove_file(path):
+    """Remove a file, logging instead of raising if that fails.
+
+    Args:
+        path (str): The path to the file.
+    """
+    try:
+        os.remove(path)
+    except OSError as e:
+        getLogger(__name__).warning("Could not remove %s: %s", path, e)
+
+
 class ModelStatus:
     """Model statuses.
 
@@ -93,6 +106,7 @@ class FLExperiment:
         self.experiment_submitted = False
 
         self.is_validate_task_exist = False
+        self._archive_removal = None
 
         self.logger = getLogger(__name__)
         setup_logging()
@@ -261,7 +275,11 @@ class FLExperiment:
         # Prepare requirements file to restore python env
         dump_requirements_file(keep_original_prefixes=True, prefixes=pip_install_options)
 
-        # Compress te workspace to restore it on collaborator
+        # Compress te workspace to restore it on collaborator. A previous
+        # archive at the same path has to be gone before the new one is made
+        if self._archive_removal is not None:
+            self._archive_removal.join()
+            self._archive_removal = None
         self.arch_path = self._pack_the_workspace()
 
     def start(
@@ -472,10 +490,23 @@ class FLExperiment:
 
         return arch_path
 
-    def remove_workspace_archive(self):
-        """Remove the workspace archive."""
-        os.remove(self.arch_path)
+    def remove_workspace_archive(self) -> Thread:
+        """Remove the workspace archive.
+
+        The archive is unlinked by a background thread, so a slow filesystem
+        does not delay the experiment submission. Preparing the workspace
+        distribution again waits for the removal.
+
+        Returns:
+            Thread: The thread removing the archive. Join it to wait until the
+                archive is gone.
+        """
+        self._archive_removal = Thread(
+            target=_remove_file, args=(self.arch_path,), name="remove-workspace-archive"
+        )
+        self._archive_removal.start()
         del self.arch_path
+        return self._archive_removal
 
     def _get_initial_tensor_dict(self, model_provider):
         """Extracts initial weights from the model.
@@ -37,6 +37,7 @@ class Federation:
         cert_chain=None,
         api_cert=None,
         api_private_key=None,
+        pool_size=1,
     ) -> None:
         """
         Initialize federation.
@@ -56,6 +57,8 @@ class Federation:
             cert_chain (str): Path to a certificate chain to CA.
             api_cert (str): Path to API certificate.
             api_private_key (str): Path to API private key.
+            pool_size (int): Number of connections to the director that
+                concurrent calls are spread over.
         """
         if director_node_fqdn is None:
             self.director_node_fqdn = getfqdn_env()
@@ -77,6 +80,7 @@ class Federation:
             root_certificate=cert_chain,
             private_key=api_private_key,
             certificate=api_cert,
+            pool_size=pool_size,
         )
 
         # Request sample and target shapes from Director.
@@ -4,22 +4,132 @@
 
 """Director clients module."""
 
+import itertools
 import logging
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Type
+from functools import lru_cache
+from hashlib import sha256
+from pathlib import Path
+from typing import Callable, List, Optional, Type
 
 import grpc
+from grpc.experimental import session_cache
 
 from openfl.interface.interactive_api.shard_descriptor import ShardDescriptor
 from openfl.pipelines import NoCompressionPipeline
 from openfl.protocols import director_pb2, director_pb2_grpc, interceptors
 from openfl.protocols.utils import construct_model_proto, deconstruct_model_proto
-from openfl.transport.grpc.director_server import CLIENT_ID_DEFAULT
+from openfl.transport.grpc.director_server import CLIENT_ID_DEFAULT, EXPERIMENT_DATA_SIZE_KEY
 from openfl.transport.grpc.exceptions import ShardNotFoundError
-from openfl.transport.grpc.grpc_channel_options import channel_options
+from openfl.transport.grpc.grpc_channel_options import (
+    compress_experiment_data,
+    director_client_options,
+    envoy_channel_options,
+)
 
 logger = logging.getLogger(__name__)
 
+READ_AHEAD_CHUNKS = 4
+
+# TLS sessions are shared by all director connections of the process, so a
+# reconnecting channel resumes its session instead of a full handshake
+SSL_SESSION_CACHE_SIZE = 64
+_ssl_session_cache = session_cache.ssl_session_cache_lru(SSL_SESSION_CACHE_SIZE)
+
+# Director clients of the same process with the same address and
+# credentials share their channels, and so their HTTP/2 connections. Each
+# entry holds the channel and the number of clients using it, the channel
+# is closed once the last of them is closed or garbage collected.
+_shared_channels = {}
+_shared_channels_lock = threading.Lock()
+
+
+def _acquire_shared_channel(key: tuple, create_channel: Callable[[], grpc.Channel]) -> grpc.Channel:
+    """Get the channel shared under the key, creating it on first use.
+
+    Every call has to be paired with a _release_shared_channels call.
+
+    Args:
+        key (tuple): The director address, the credentials digest (None
+            for insecure channels), whether the channel belongs to a pool
+            and its index in the pool.
+        create_channel (Callable[[], grpc.Channel]): The channel factory.
+
+    Returns:
+        grpc.Channel: The shared channel.
+    """
+    with _shared_channels_lock:
+        entry = _shared_channels.get(key)
+        if entry is None:
+            entry = _shared_channels[key] = [create_channel(), 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def _release_shared_channels(keys: List[tuple]) -> None:
+    """Release shared channels, closing those no client uses anymore.
+
+    Args:
+        keys (List[tuple]): The keys the channels were acquired under.
+    """
+    unused_channels = []
+    with _shared_channels_lock:
+        for key in keys:
+            entry = _shared_channels[key]
+            entry[1] -= 1
+            if not entry[1]:
+                del _shared_channels[key]
+                unused_channels.append(entry[0])
+    for channel in unused_channels:
+        channel.close()
+
+
+def _read_certificates(*paths) -> List[bytes]:
+    """Read the TLS certificate files concurrently.
+
+    The files often live on network filesystems, where every read is a
+    round trip.
+
+    Args:
+        *paths (str): The paths to the certificate files.
+
+    Returns:
+        List[bytes]: The file contents, in the order of the paths.
+    """
+    try:
+        with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+            return list(executor.map(Path.read_bytes, map(Path, paths)))
+    except FileNotFoundError as exc:
+        raise Exception(f"Provided certificate file is not exist: {exc.filename}")
+
+
+@lru_cache(maxsize=16)
+def _get_channel_credentials(
+    root_certificate: bytes, private_key: bytes, certificate: bytes
+) -> grpc.ChannelCredentials:
+    """Get the TLS channel credentials, reusing those of identical files.
+
+    Clients of the same process usually load the same certificates, so
+    they share the credentials object instead of parsing the PEMs again.
+
+    Args:
+        root_certificate (bytes): The root certificate.
+        private_key (bytes): The private key.
+        certificate (bytes): The certificate chain.
+
+    Returns:
+        grpc.ChannelCredentials: The channel credentials.
+    """
+    return grpc.ssl_channel_credentials(
+        root_certificates=root_certificate,
+        private_key=private_key,
+        certificate_chain=certificate,
+    )
+
 
 class ShardDirectorClient:
     """
@@ -31,7 +141,9 @@ class ShardDirectorClient:
     Attributes:
         shard_name (str): The name of the shard.
         stub (director_pb2_grpc.DirectorStub): The gRPC stub for communication
-            with the director.
+            with the director, used for streaming experiment data.
+        _unary_stubs (Iterator[director_pb2_grpc.DirectorStub]): The
+            round-robin iterator over the stubs used for unary calls.
     """
 
     def __init__(
@@ -44,6 +156,8 @@ class ShardDirectorClient:
         root_certificate=None,
         private_key=None,
         certificate=None,
+        options=None,
+        pool_size=1,
     ) -> None:
         """
         Initialize a shard director client object.
@@ -59,32 +173,47 @@ class ShardDirectorClient:
                 connection.
             certificate (str): The path to the certificate for the TLS
                 connection.
+            options (list, optional): The gRPC channel options. Defaults to
+                the options tuned for streaming experiment data.
+            pool_size (int, optional): The number of connections to the
+                director. With more than one, the experiment data stream
+                keeps a connection to itself and the unary calls are spread
+                over the others. Defaults to 1.
         """
         self.shard_name = shard_name
         director_addr = f"{director_host}:{director_port}"
         logger.info("Director address: %s", director_addr)
+        if options is None:
+            options = envoy_channel_options
+        if pool_size > 1:
+            # Otherwise the channels would share the same connection
+            options = options + [("grpc.use_local_subchannel_pool", 1)]
         if not tls:
-            channel = grpc.insecure_channel(director_addr, options=channel_options)
+            channels = [
+                grpc.insecure_channel(director_addr, options=options) for _ in range(pool_size)
+            ]
         else:
             if not (root_certificate and private_key and certificate):
                 raise Exception("No certificates provided")
-            try:
-                with open(root_certificate, "rb") as f:
-                    root_certificate_b = f.read()
-                with open(private_key, "rb") as f:
-                    private_key_b = f.read()
-                with open(certificate, "rb") as f:
-                    certificate_b = f.read()
-            except FileNotFoundError as exc:
-                raise Exception(f"Provided certificate file is not exist: {exc.filename}")
-
-            credentials = grpc.ssl_channel_credentials(
-                root_certificates=root_certificate_b,
-                private_key=private_key_b,
-                certificate_chain=certificate_b,
+            root_certificate_b, private_key_b, certificate_b = _read_certificates(
+                root_certificate, private_key, certificate
             )
-            channel = grpc.secure_channel(director_addr, credentials, options=channel_options)
-        self.stub = director_pb2_grpc.DirectorStub(channel)
+
+            credentials = _get_channel_credentials(root_certificate_b, private_key_b, certificate_b)
+            options = options + [("grpc.ssl_session_cache", _ssl_session_cache)]
+            channels = [
+                grpc.secure_channel(director_addr, credentials, options=options)
+                for _ in range(pool_size)
+            ]
+        self._channels = channels
+        stubs = [director_pb2_grpc.DirectorStub(channel) for channel in channels]
+        self.stub = stubs[0]
+        self._unary_stubs = itertools.cycle(stubs[1:] or stubs)
+
+    def close(self) -> None:
+        """Close the connections to the director."""
+        for channel in self._channels:
+            channel.close()
 
     def report_shard_info(
         self, shard_descriptor: Type[ShardDescriptor], cuda_devices: tuple
@@ -115,7 +244,7 @@ class ShardDirectorClient:
         )
 
         request = director_pb2.UpdateShardInfoRequest(shard_info=shard_info)
-        acknowledgement = self.stub.UpdateShardInfo(request)
+        acknowledgement = next(self._unary_stubs).UpdateShardInfo(request)
         return acknowledgement.accepted
 
     def wait_experiment(self):
@@ -126,7 +255,7 @@ class ShardDirectorClient:
             experiment_name (str): The name of the experiment.
         """
         logger.info("Waiting for an experiment to run...")
-        response = self.stub.WaitExperiment(self._get_experiment_data())
+        response = next(self._unary_stubs).WaitExperiment(self._get_experiment_data())
         logger.info("New experiment received: %s", response)
         experiment_name = response.experiment_name
         if not experiment_name:
@@ -153,6 +282,24 @@ class ShardDirectorClient:
 
         return data_stream
 
+    @staticmethod
+    def get_experiment_data_size(data_stream) -> Optional[int]:
+        """
+        Get the total size of the experiment data advertised by the director.
+
+        Args:
+            data_stream (grpc._channel._MultiThreadedRendezvous): The data
+                stream of the experiment data.
+
+        Returns:
+            Optional[int]: The size in bytes, or None if the director does not
+                advertise it.
+        """
+        for key, value in data_stream.initial_metadata() or ():
+            if key == EXPERIMENT_DATA_SIZE_KEY:
+                return int(value)
+        return None
+
     def set_experiment_failed(
         self,
         experiment_name: str,
@@ -175,7 +322,7 @@ class ShardDirectorClient:
             error_code=error_code,
             error_description=error_description,
         )
-        self.stub.SetExperimentFailed(request)
+        next(self._unary_stubs).SetExperimentFailed(request)
 
     def _get_experiment_data(self):
         """Generate the experiment data request.
@@ -222,7 +369,7 @@ class ShardDirectorClient:
         logger.debug("Sending health check status: %s", status)
 
         try:
-            response = self.stub.UpdateEnvoyStatus(status)
+            response = next(self._unary_stubs).UpdateEnvoyStatus(status)
         except grpc.RpcError as rpc_error:
             logger.error(rpc_error)
             if rpc_error.code() == grpc.StatusCode.NOT_FOUND:
@@ -241,7 +388,8 @@ class DirectorClient:
 
     Attributes:
         stub (director_pb2_grpc.DirectorStub): The gRPC stub for communication
-            with the director.
+            with the director. Each access returns the next stub of the
+            connection pool in round-robin order.
     """
 
     def __init__(
@@ -254,6 +402,7 @@ class DirectorClient:
         root_certificate: str,
         private_key: str,
         certificate: str,
+        pool_size: int = 1,
     ) -> None:
         """
         Initialize director client object.
@@ -269,38 +418,80 @@ class DirectorClient:
                 connection.
             certificate (str): The path to the certificate for the TLS
                 connection.
+            pool_size (int, optional): The number of connections to the
+                director. Concurrent calls are spread over them instead of
+                sharing a single HTTP/2 connection. Defaults to 1.
         """
         director_addr = f"{director_host}:{director_port}"
+        options = director_client_options
+        if pool_size > 1:
+            # Otherwise the channels would share the same connection
+            options = options + [("grpc.use_local_subchannel_pool", 1)]
         if not tls:
             if not client_id:
                 client_id = CLIENT_ID_DEFAULT
-            channel = grpc.insecure_channel(director_addr, options=channel_options)
             headers = {
                 "client_id": client_id,
             }
             header_interceptor = interceptors.headers_adder(headers)
-            channel = grpc.intercept_channel(channel, header_interceptor)
+            channel_keys = [
+                (director_addr, None, pool_size > 1, index) for index in range(pool_size)
+            ]
+            channels = [
+                grpc.intercept_channel(
+                    _acquire_shared_channel(
+                        key, lambda: grpc.insecure_channel(director_addr, options=options)
+                    ),
+                    header_interceptor,
+                )
+                for key in channel_keys
+            ]
         else:
             if not (root_certificate and private_key and certificate):
                 raise Exception("No certificates provided")
-            try:
-                with open(root_certificate, "rb") as f:
-                    root_certificate_b = f.read()
-                with open(private_key, "rb") as f:
-                    private_key_b = f.read()
-                with open(certificate, "rb") as f:
-                    certificate_b = f.read()
-            except FileNotFoundError as exc:
-                raise Exception(f"Provided certificate file is not exist: {exc.filename}")
-
-            credentials = grpc.ssl_channel_credentials(
-                root_certificates=root_certificate_b,
-                private_key=private_key_b,
-                certificate_chain=certificate_b,
+            root_certificate_b, private_key_b, certificate_b = _read_certificates(
+                root_certificate, private_key, certificate
             )
 
-            channel = grpc.secure_channel(director_addr, credentials, options=channel_options)
-        self.stub = director_pb2_grpc.DirectorStub(channel)
+            credentials = _get_channel_credentials(root_certificate_b, private_key_b, certificate_b)
+            credentials_digest = sha256(
+                root_certificate_b + private_key_b + certificate_b
+            ).hexdigest()
+
+            options = options + [("grpc.ssl_session_cache", _ssl_session_cache)]
+            channel_keys = [
+                (director_addr, credentials_digest, pool_size > 1, index)
+                for index in range(pool_size)
+            ]
+            channels = [
+                _acquire_shared_channel(
+                    key, lambda: grpc.secure_channel(director_addr, credentials, options=options)
+                )
+                for key in channel_keys
+            ]
+        # The shared channels are released on close() or, failing that, once
+        # the client is garbage collected
+        self._release_channels = weakref.finalize(self, _release_shared_channels, channel_keys)
+        self._stubs = itertools.cycle(
+            [director_pb2_grpc.DirectorStub(channel) for channel in channels]
+        )
+        self.compress_experiment_data = compress_experiment_data()
+
+    def close(self) -> None:
+        """Release the connections to the director.
+
+        The connections are closed unless other clients still share them.
+        """
+        self._release_channels()
+
+    @property
+    def stub(self):
+        """Get the stub of the next pooled connection.
+
+        Returns:
+            director_pb2_grpc.DirectorStub: The gRPC stub.
+        """
+        return next(self._stubs)
 
     def set_new_experiment(self, name, col_names, arch_path, initial_tensor_dict=None):
         """
@@ -320,16 +511,24 @@ class DirectorClient:
         logger.info("Submitting new experiment %s to director", name)
         if initial_tensor_dict:
             model_proto = construct_model_proto(initial_tensor_dict, 0, NoCompressionPipeline())
+            archive_hash = sha256()
             experiment_info_gen = self._get_experiment_info(
                 arch_path=arch_path,
                 name=name,
                 col_names=col_names,
                 model_proto=model_proto,
+                archive_hash=archive_hash,
             )
-            resp = self.stub.SetNewExperiment(experiment_info_gen)
+            compression = None
+            if self.compress_experiment_data:
+                compression = grpc.Compression.Gzip
+            resp = self.stub.SetNewExperiment(experiment_info_gen, compression=compression)
+            # Directors predating the digest leave it empty
+            if resp.digest and resp.digest != archive_hash.digest():
+                raise Exception(f"Experiment {name} archive was corrupted in transit")
             return resp
 
-    def _get_experiment_info(self, arch_path, name, col_names, model_proto):
+    def _get_experiment_info(self, arch_path, name, col_names, model_proto, archive_hash=None):
         """
         Generate the experiment data request.
 
@@ -341,26 +540,38 @@ class DirectorClient:
             name (str): The name of the experiment.
             col_names (List[str]): The names of the collaborators.
             model_proto (ModelProto): The initial model.
+            archive_hash (optional): A hashlib object updated with the
+                archive as it is sent. Defaults to None.
 
         Yields:
-            director_pb2.ExperimentInfo: The experiment data.
+            director_pb2.ExperimentInfo: The experiment data. The same message
+                is updated in place for every chunk, gRPC serializes it before
+                asking for the next one.
         """
-        with open(arch_path, "rb") as arch:
-            max_buffer_size = 2 * 1024 * 1024
-            chunk = arch.read(max_buffer_size)
-            while chunk != b"":
+        max_buffer_size = 4 * 1024 * 1024
+        # The experiment description and the initial model are copied into
+        # the message once rather than for every chunk
+        experiment_info = director_pb2.ExperimentInfo(
+            name=name,
+            collaborator_names=col_names,
+            model_proto=model_proto,
+        )
+        # The next chunks are read by a separate thread while gRPC sends the
+        # current one, so disk reads overlap with the upload
+        with open(arch_path, "rb") as arch, ThreadPoolExecutor(max_workers=1) as reader:
+            read_ahead = deque(
+                reader.submit(arch.read, max_buffer_size) for _ in range(READ_AHEAD_CHUNKS)
+            )
+            while True:
+                chunk = read_ahead.popleft().result()
                 if not chunk:
-                    raise StopIteration
-                # TODO: add hash or/and size to check
-                experiment_info = director_pb2.ExperimentInfo(
-                    name=name,
-                    collaborator_names=col_names,
-                    model_proto=model_proto,
-                )
+                    break
+                read_ahead.append(reader.submit(arch.read, max_buffer_size))
+                if archive_hash is not None:
+                    archive_hash.update(chunk)
                 experiment_info.experiment_data.size = len(chunk)
                 experiment_info.experiment_data.npbytes = chunk
                 yield experiment_info
-                chunk = arch.read(max_buffer_size)
 
     def get_experiment_status(self, experiment_name):
         """
@@ -477,6 +688,8 @@ class DirectorClient:
             result (Union[director_pb2.GetEnvoysResponse,
                 Dict[str, Dict[str, Any]]]): The envoys info.
         """
+        # The director reuses its response while the envoys are unchanged,
+        # so every call gets the current envoy list
         envoys = self.stub.GetEnvoys(director_pb2.GetEnvoysRequest())
         if raw_result:
             return envoys
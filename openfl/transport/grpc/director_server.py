@@ -6,9 +6,13 @@
 
 import asyncio
 import logging
-import uuid
+import os
+import tempfile
+import time
+from functools import lru_cache, partial
+from hashlib import sha256
 from pathlib import Path
-from typing import Callable, Optional, Union
+from typing import BinaryIO, Callable, Optional, Tuple, Union
 
 import grpc
 from google.protobuf.json_format import MessageToDict, ParseDict
@@ -16,13 +20,132 @@ from grpc import aio, ssl_server_credentials
 
 from openfl.pipelines import NoCompressionPipeline
 from openfl.protocols import base_pb2, director_pb2, director_pb2_grpc
-from openfl.protocols.utils import construct_model_proto, deconstruct_model_proto, get_headers
+from openfl.protocols.utils import construct_model_proto, deconstruct_model_proto
 from openfl.transport.grpc.exceptions import ShardNotFoundError
-from openfl.transport.grpc.grpc_channel_options import channel_options
+from openfl.transport.grpc.grpc_channel_options import (
+    compress_experiment_data,
+    director_server_options,
+)
 
 logger = logging.getLogger(__name__)
 
 CLIENT_ID_DEFAULT = "__default__"
+EXPERIMENT_DATA_SIZE_KEY = "experiment-data-size"
+EXPERIMENT_DATA_CHUNK_SIZE = 2 * 2**20
+MIN_EXPERIMENT_DATA_CHUNK_SIZE = 64 * 2**10
+# Far enough below max_message_length to leave room for the message framing
+MAX_EXPERIMENT_DATA_CHUNK_SIZE = 64 * 2**20
+EXPERIMENT_DATA_WRITE_STALL_IN_SECONDS = 0.1
+SERVER_SHUTDOWN_GRACE_IN_SECONDS = 5
+# Leading bytes of zip, gzip, bzip2, xz and zstd files
+COMPRESSED_FILE_SIGNATURES = (
+    b"PK\x03\x04",
+    b"\x1f\x8b",
+    b"BZh",
+    b"\xfd7zXZ\x00",
+    b"\x28\xb5\x2f\xfd",
+)
+
+
+def _read_pem(path: Union[Path, str]) -> bytes:
+    """Read a PEM file, reusing an earlier read of the unchanged file.
+
+    Args:
+        path (Union[Path, str]): The path to the PEM file.
+
+    Returns:
+        bytes: The file content.
+    """
+    stat = os.stat(path)
+    return _read_pem_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=8)
+def _read_pem_cached(path: str, mtime_ns: int, size: int) -> bytes:
+    """Read a PEM file once per modification time and size.
+
+    Args:
+        path (str): The path to the PEM file.
+        mtime_ns (int): The modification time of the file in nanoseconds.
+        size (int): The size of the file in bytes.
+
+    Returns:
+        bytes: The file content.
+    """
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def _settle(future: asyncio.Future) -> None:
+    """Wait until an executor future has finished, whatever its outcome.
+
+    Cancelling an executor future does not stop a call that is already
+    running, so files it uses may only be closed once it has finished. The
+    outcome of the call is discarded and a cancellation received while
+    waiting is raised once the call has finished.
+
+    Args:
+        future (asyncio.Future): The executor future.
+    """
+    cancelled = False
+    while not future.done():
+        try:
+            await asyncio.wait([future])
+        except asyncio.CancelledError:
+            cancelled = True
+    if not future.cancelled():
+        future.exception()
+    if cancelled:
+        raise asyncio.CancelledError
+
+
+def _is_compressed(head: bytes) -> bool:
+    """Check whether file data is in a compressed format.
+
+    Args:
+        head (bytes): The leading bytes of the file.
+
+    Returns:
+        bool: True if the data starts with the signature of a compressed
+            format.
+    """
+    return head.startswith(COMPRESSED_FILE_SIGNATURES)
+
+
+def _open_with_size(path: Union[Path, str]) -> Tuple[BinaryIO, int]:
+    """Open a file for reading and get its size.
+
+    Args:
+        path (Union[Path, str]): The path to the file.
+
+    Returns:
+        Tuple[BinaryIO, int]: The file object and the size of the file in
+            bytes.
+    """
+    f = open(path, "rb")
+    return f, os.fstat(f.fileno()).st_size
+
+
+@lru_cache(maxsize=4)
+def _get_server_credentials(
+    private_key: bytes, certificate: bytes, root_certificate: bytes
+) -> grpc.ServerCredentials:
+    """Get the mTLS server credentials, reusing those of identical files.
+
+    Args:
+        private_key (bytes): The server's private key.
+        certificate (bytes): The server's certificate.
+        root_certificate (bytes): The root certificate to verify clients
+            with.
+
+    Returns:
+        grpc.ServerCredentials: The server credentials.
+    """
+    return ssl_server_credentials(
+        ((private_key, certificate),),
+        root_certificates=root_certificate,
+        require_client_auth=True,
+    )
 
 
 class DirectorGRPCServer(director_pb2_grpc.DirectorServicer):
@@ -43,6 +166,10 @@ class DirectorGRPCServer(director_pb2_grpc.DirectorServicer):
         certificate (Path): The path to the server's certificate for the TLS
             connection.
         server (grpc.Server): The gRPC server.
+        compress_experiment_data (bool): Whether to gzip the experiment data
+            streamed to envoys even if it is compressed already.
+        experiment_data_chunk_size (int): The largest chunk of experiment
+            data streamed to envoys, in bytes.
     """
 
     def __init__(
@@ -57,6 +184,7 @@ class DirectorGRPCServer(director_pb2_grpc.DirectorServicer):
         listen_host: str = "[::]",
         listen_port: int = 50051,
         envoy_health_check_period: int = 0,
+        experiment_data_chunk_size: int = EXPERIMENT_DATA_CHUNK_SIZE,
         **kwargs,
     ) -> None:
         """
@@ -83,6 +211,9 @@ class DirectorGRPCServer(director_pb2_grpc.DirectorServicer):
                 50051.
             envoy_health_check_period (int, optional): The period for health
                 checks. Defaults to 0.
+            experiment_data_chunk_size (int, optional): The largest chunk of
+                experiment data streamed to envoys, in bytes, up to 64 MiB.
+                Defaults to 2 MiB.
             **kwargs: Additional keyword arguments.
         """
         # TODO: add working directory
@@ -96,6 +227,14 @@ class DirectorGRPCServer(director_pb2_grpc.DirectorServicer):
         self._fill_certs(root_certificate, private_key, certificate)
         self.server = None
         self.root_dir = Path.cwd()
+        # Uncompressed experiment archives are always gzipped on the wire,
+        # compressed ones only on request
+        self.compress_experiment_data = compress_experiment_data()
+        self.experiment_data_chunk_size = experiment_data_chunk_size
+        # A GetEnvoys response is served again until the director reports a
+        # change in the envoys' statuses
+        self._envoys_response = None
+        self._envoys_response_generation = None
         self.director = director_cls(
             tls=self.tls,
             root_certificate=self.root_certificate,
@@ -138,35 +277,65 @@ class DirectorGRPCServer(director_pb2_grpc.DirectorServicer):
         """
         if self.tls:
             return context.auth_context()["x509_common_name"][0].decode("utf-8")
-        headers = get_headers(context)
-        client_id = headers.get("client_id", CLIENT_ID_DEFAULT)
-        return client_id
+        for key, value in context.invocation_metadata():
+            if key == "client_id":
+                return value
+        return CLIENT_ID_DEFAULT
 
     def start(self):
         """Launch the director GRPC server."""
-        loop = asyncio.get_event_loop()  # TODO: refactor after end of support for python3.6
-        loop.create_task(self.director.start_experiment_execution_loop())
-        loop.run_until_complete(self._run_server())
+        # Not asyncio.run: before Python 3.10 the director's asyncio primitives
+        # are bound to the default loop when created, so it has to run that one
+        loop = asyncio.get_event_loop()
+        try:
+            loop.run_until_complete(self._main())
+        except KeyboardInterrupt:
+            logger.info("Stopping director server")
+        finally:
+            # Like asyncio.run, cancel what is left before closing the loop
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    async def _main(self):
+        """Serve requests and run experiments until the server stops."""
+        execution_loop = asyncio.ensure_future(self.director.start_experiment_execution_loop())
+        try:
+            await self._run_server()
+        finally:
+            if self.server is not None:
+                # Calls in flight, such as archive streams, get time to finish
+                await self.server.stop(SERVER_SHUTDOWN_GRACE_IN_SECONDS)
+            execution_loop.cancel()
+            await asyncio.gather(execution_loop, return_exceptions=True)
+
+    def _load_server_credentials(self) -> grpc.ServerCredentials:
+        """Load the mTLS server credentials from the certificate files.
+
+        Returns:
+            grpc.ServerCredentials: The server credentials.
+        """
+        return _get_server_credentials(
+            _read_pem(self.private_key),
+            _read_pem(self.certificate),
+            _read_pem(self.root_certificate),
+        )
 
     async def _run_server(self):
         """Run the gRPC server."""
-        self.server = aio.server(options=channel_options)
+        self.server = aio.server(options=director_server_options)
         director_pb2_grpc.add_DirectorServicer_to_server(self, self.server)
 
         if not self.tls:
             self.server.add_insecure_port(self.listen_uri)
         else:
-            with open(self.private_key, "rb") as f:
-                private_key_b = f.read()
-            with open(self.certificate, "rb") as f:
-                certificate_b = f.read()
-            with open(self.root_certificate, "rb") as f:
-                root_certificate_b = f.read()
-            server_credentials = ssl_server_credentials(
-                ((private_key_b, certificate_b),),
-                root_certificates=root_certificate_b,
-                require_client_auth=True,
-            )
+            # Certificates may live on a slow mount, and the experiment loop
+            # already runs on this event loop, so they are read off it
+            loop = asyncio.get_running_loop()
+            server_credentials = await loop.run_in_executor(None, self._load_server_credentials)
             self.server.add_secure_port(self.listen_uri, server_credentials)
         logger.info("Starting director server on %s", self.listen_uri)
         await self.server.start()
@@ -204,13 +373,43 @@ class DirectorGRPCServer(director_pb2_grpc.DirectorServicer):
             director_pb2.SetNewExperimentResponse: The response to the request.
         """
         # TODO: add streaming reader
-        data_file_path = self.root_dir / str(uuid.uuid4())
-        with open(data_file_path, "wb") as data_file:
-            async for request in stream:
-                if request.experiment_data.size == len(request.experiment_data.npbytes):
-                    data_file.write(request.experiment_data.npbytes)
-                else:
-                    raise Exception("Could not register new experiment")
+        # mkstemp names and creates the file in one go and hands back its fd
+        data_file_fd, data_file_path = tempfile.mkstemp(prefix="experiment_", dir=self.root_dir)
+        data_file_path = Path(data_file_path)
+        loop = asyncio.get_running_loop()
+        # The digest lets the sender verify the archive as it was stored
+        archive_hash = sha256()
+        try:
+            with os.fdopen(data_file_fd, "wb") as data_file:
+
+                def write_chunk(data):
+                    data_file.write(data)
+                    archive_hash.update(data)
+
+                pending_write = None
+                try:
+                    async for request in stream:
+                        experiment_data = request.experiment_data
+                        data = experiment_data.npbytes
+                        if experiment_data.size != len(data):
+                            await context.abort(
+                                grpc.StatusCode.DATA_LOSS, "Could not register new experiment"
+                            )
+                        if pending_write is not None:
+                            await pending_write
+                        # Writes and hashing go to a worker thread so the event loop keeps
+                        # serving RPCs, and the next chunk is received meanwhile
+                        pending_write = loop.run_in_executor(None, write_chunk, data)
+                    if pending_write is not None:
+                        await pending_write
+                finally:
+                    # The file must not be closed or removed under a write still in flight
+                    if pending_write is not None:
+                        await _settle(pending_write)
+        except BaseException:
+            # A partial archive is of no use to anyone
+            data_file_path.unlink(missing_ok=True)
+            raise
 
         tensor_dict = None
         if request.model_proto:
@@ -227,7 +426,9 @@ class DirectorGRPCServer(director_pb2_grpc.DirectorServicer):
         )
 
         logger.info("Experiment %s registered", request.name)
-        return director_pb2.SetNewExperimentResponse(accepted=is_accepted)
+        return director_pb2.SetNewExperimentResponse(
+            accepted=is_accepted, digest=archive_hash.digest()
+        )
 
     async def GetExperimentStatus(self, request, context):  # NOQA: N802
         """
@@ -295,22 +496,51 @@ class DirectorGRPCServer(director_pb2_grpc.DirectorServicer):
         Args:
             request (director_pb2.GetExperimentDataRequest): The request from
                 the collaborator.
-            context (grpc.ServicerContext): The context of the request.
-
-        Yields:
-            director_pb2.ExperimentData: The experiment data.
+            context (grpc.ServicerContext): The context of the request. The
+                experiment data is written to it chunk by chunk.
         """
         # TODO: add size filling
         # TODO: add experiment name field
         # TODO: rename npbytes to data
         data_file_path = self.director.get_experiment_data(request.experiment_name)
-        max_buffer_size = 2 * 1024 * 1024
-        with open(data_file_path, "rb") as df:
-            while True:
-                data = df.read(max_buffer_size)
-                if len(data) == 0:
-                    break
-                yield director_pb2.ExperimentData(size=len(data), npbytes=data)
+        # Streams start with small chunks that double up to the configured
+        # size while the envoy keeps up, and halve whenever a write stalls on
+        # flow control, so slow links are not flooded with huge messages
+        max_chunk_size = self.experiment_data_chunk_size
+        min_chunk_size = min(MIN_EXPERIMENT_DATA_CHUNK_SIZE, max_chunk_size)
+        chunk_size = min_chunk_size
+        loop = asyncio.get_running_loop()
+        # All file I/O goes to a worker thread so the event loop keeps serving
+        # RPCs, and the next chunk is read while the current one is sent
+        df, data_size = await loop.run_in_executor(None, _open_with_size, data_file_path)
+        with df:
+            read_chunk = partial(loop.run_in_executor, None, df.read)
+            next_chunk = read_chunk(chunk_size)
+            try:
+                data = await next_chunk
+                # The first chunk tells whether the archive is compressed already
+                if self.compress_experiment_data or not _is_compressed(data):
+                    context.set_compression(grpc.Compression.Gzip)
+                # The total size lets envoys allocate the archive file up front
+                await context.send_initial_metadata(((EXPERIMENT_DATA_SIZE_KEY, str(data_size)),))
+                # Chunks are written straight to the context, which spares the
+                # async generator round trip per chunk. Each write serializes
+                # the message before suspending, so one instance is refilled
+                reply = director_pb2.ExperimentData()
+                while data:
+                    next_chunk = read_chunk(chunk_size)
+                    reply.size = len(data)
+                    reply.npbytes = data
+                    write_start = time.monotonic()
+                    await context.write(reply)
+                    if time.monotonic() - write_start > EXPERIMENT_DATA_WRITE_STALL_IN_SECONDS:
+                        chunk_size = max(chunk_size // 2, min_chunk_size)
+                    else:
+                        chunk_size = min(chunk_size * 2, max_chunk_size)
+                    data = await next_chunk
+            finally:
+                # The file must not be closed under a read still in flight
+                await _settle(next_chunk)
 
     async def WaitExperiment(self, request, context):  # NOQA:N802
         """
@@ -419,9 +649,11 @@ class DirectorGRPCServer(director_pb2_grpc.DirectorServicer):
         if self.get_caller(context) != CLIENT_ID_DEFAULT:
             return response
         logger.error(
-            f"Collaborator {request.collaborator_name} failed with error code:"
-            f" {request.error_code}, error_description: {request.error_description}"
-            f"Stopping experiment."
+            "Collaborator %s failed with error code: %s, error_description: %s"
+            "Stopping experiment.",
+            request.collaborator_name,
+            request.error_code,
+            request.error_description,
         )
         self.director.set_experiment_failed(
             experiment_name=request.experiment_name,
@@ -474,6 +706,10 @@ class DirectorGRPCServer(director_pb2_grpc.DirectorServicer):
         Returns:
             director_pb2.GetEnvoysResponse: The response to the request.
         """
+        generation = self.director.get_envoys_generation()
+        if self._envoys_response is not None and self._envoys_response_generation == generation:
+            return self._envoys_response
+
         envoy_infos = self.director.get_envoys()
         envoy_statuses = []
         for envoy_info in envoy_infos:
@@ -491,7 +727,9 @@ class DirectorGRPCServer(director_pb2_grpc.DirectorServicer):
 
             envoy_statuses.append(envoy_info_message)
 
-        return director_pb2.GetEnvoysResponse(envoy_infos=envoy_statuses)
+        self._envoys_response = director_pb2.GetEnvoysResponse(envoy_infos=envoy_statuses)
+        self._envoys_response_generation = generation
+        return self._envoys_response
 
     async def GetExperimentsList(self, request, context):  # NOQA:N802
         """Get list of experiments description.
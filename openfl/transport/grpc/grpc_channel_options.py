@@ -1,6 +1,13 @@
 # Copyright 2020-2024 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import os
+
+# Experiment archives are zip files, which are deflated already, so gzip on
+# the wire only pays off on slow links. Setting OPENFL_GRPC_COMPRESS=1 gzips
+# the archive uploads of the Director clients and the archive downloads
+# served by the Director, also for compressed archives.
+COMPRESS_EXPERIMENT_DATA_ENV = "OPENFL_GRPC_COMPRESS"
 
 max_metadata_size = 32 * 2**20
 max_message_length = 2**30
@@ -10,3 +17,53 @@ channel_options = [
     ("grpc.max_send_message_length", max_message_length),
     ("grpc.max_receive_message_length", max_message_length),
 ]
+
+# Envoys stream experiment archives from the director over possibly
+# high-latency links: a large initial stream window keeps the pipe full
+# and keepalive pings detect dead connections during long waits. Pings are
+# also sent while no call is in flight, so the connection survives between
+# health checks and reconnecting envoys only repeat the registration call.
+envoy_channel_options = channel_options + [
+    ("grpc.http2.lookahead_bytes", 4 * 2**20),
+    ("grpc.keepalive_time_ms", 30 * 1000),
+    ("grpc.keepalive_timeout_ms", 10 * 1000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
+# The director has to accept the envoys' keepalive pings, otherwise it
+# closes their connections for pinging too often. Its large receive window
+# keeps experiment archive uploads from stalling on flow control, and big
+# frames and write buffers let it stream archives to envoys at link speed.
+# Every envoy multiplexes its calls over one connection, which may carry up
+# to 1024 concurrent streams. The director pings idle peers itself and
+# reclaims connections that carried no call for ten minutes.
+director_server_options = channel_options + [
+    ("grpc.http2.min_ping_interval_without_data_ms", 10 * 1000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.max_concurrent_streams", 1024),
+    ("grpc.keepalive_time_ms", 20 * 1000),
+    ("grpc.keepalive_timeout_ms", 10 * 1000),
+    ("grpc.max_connection_idle_ms", 10 * 60 * 1000),
+    ("grpc.http2.lookahead_bytes", 4 * 2**20),
+    ("grpc.http2.max_frame_size", 2**24 - 1),
+    ("grpc.http2.write_buffer_size", 4 * 2**20),
+]
+
+# Users upload experiment archives and download trained models, both of
+# which are large: big HTTP/2 frames cut the framing overhead and a large
+# receive window keeps model downloads from stalling.
+director_client_options = channel_options + [
+    ("grpc.http2.lookahead_bytes", 4 * 2**20),
+    ("grpc.http2.max_frame_size", 2**24 - 1),
+    ("grpc.http2.write_buffer_size", 4 * 2**20),
+]
+
+
+def compress_experiment_data() -> bool:
+    """Check whether experiment archives are always gzipped on the wire.
+
+    Returns:
+        bool: True if OPENFL_GRPC_COMPRESS is set to 1.
+    """
+    return os.environ.get(COMPRESS_EXPERIMENT_DATA_ENV, "0") == "1"
@@ -6,12 +6,14 @@ import logging
 import os
 import shutil
 import sys
+import tempfile
 import time
+import zipfile
 from contextlib import contextmanager
 from pathlib import Path
 from subprocess import check_call  # nosec
 from sys import executable
-from typing import Optional, Tuple, Union
+from typing import BinaryIO, Optional, Tuple, Union
 
 from pip._internal.operations import freeze
 
@@ -27,6 +29,8 @@ class ExperimentWorkspace:
     Attributes:
         experiment_name (str): The name of the experiment.
         data_file_path (Path): The path to the data file for the experiment.
+        data_file (BinaryIO): The data file object for the experiment, used
+            instead of data_file_path.
         install_requirements (bool): Whether to install the requirements for
             the experiment.
         cwd (Path): The current working directory.
@@ -38,24 +42,31 @@ class ExperimentWorkspace:
     def __init__(
         self,
         experiment_name: str,
-        data_file_path: Path,
+        data_file_path: Optional[Path] = None,
         install_requirements: bool = False,
         remove_archive: bool = True,
+        data_file: Optional[BinaryIO] = None,
     ) -> None:
         """
         Initialize workspace context manager.
 
         Args:
             experiment_name (str): The name of the experiment.
-            data_file_path (Path): The path to the data file for the
-                experiment.
+            data_file_path (Path, optional): The path to the data file for
+                the experiment. Defaults to None.
             install_requirements (bool, optional): Whether to install the
                 requirements for the experiment. Defaults to False.
             remove_archive (bool, optional): Whether to remove the archive
                 after the experiment. Defaults to True.
+            data_file (BinaryIO, optional): A seekable data file object for
+                the experiment, e.g. an archive received in memory. Removing
+                the archive closes it. Defaults to None.
         """
+        if (data_file_path is None) == (data_file is None):
+            raise ValueError("Exactly one of data_file_path and data_file is expected")
         self.experiment_name = experiment_name
         self.data_file_path = data_file_path
+        self.data_file = data_file
         self.install_requirements = install_requirements
         self.cwd = Path.cwd()
         self.experiment_work_dir = self.cwd / self.experiment_name
@@ -96,15 +107,21 @@ class ExperimentWorkspace:
             shutil.rmtree(self.experiment_work_dir, ignore_errors=True)
         os.makedirs(self.experiment_work_dir)
 
-        shutil.unpack_archive(self.data_file_path, self.experiment_work_dir, format="zip")
+        if self.data_file is not None:
+            self.data_file.seek(0)
+            _extract_zip(_seekable_file(self.data_file), self.experiment_work_dir)
+        else:
+            _extract_zip(self.data_file_path, self.experiment_work_dir)
 
         if self.install_requirements:
             self._install_requirements()
 
         os.chdir(self.experiment_work_dir)
 
-        # This is needed for python module finder
-        sys.path.append(str(self.experiment_work_dir))
+        # This is needed for python module finder. Every import walks
+        # sys.path, so the workspace is added at most once
+        if str(self.experiment_work_dir) not in sys.path:
+            sys.path.append(str(self.experiment_work_dir))
 
     def __exit__(self, exc_type, exc_value, traceback):
         """Remove the workspace."""
@@ -115,15 +132,61 @@ class ExperimentWorkspace:
 
         if self.remove_archive:
             logger.debug(
-                "Exiting from the workspace context manager"
-                f" for {self.experiment_name} experiment"
-            )
-            logger.debug(
-                "Exiting from the workspace context manager"
-                f" for {self.experiment_name} experiment"
+                "Exiting from the workspace context manager for %s experiment",
+                self.experiment_name,
             )
-            logger.debug("Archive still exists: %s", self.data_file_path.exists())
-            self.data_file_path.unlink(missing_ok=False)
+            if self.data_file is not None:
+                self.data_file.close()
+            else:
+                logger.debug("Archive still exists: %s", self.data_file_path.exists())
+                self.data_file_path.unlink(missing_ok=False)
+
+
+def _seekable_file(data_file: BinaryIO) -> BinaryIO:
+    """Get a file object of the data that zipfile can seek in.
+
+    Before Python 3.11 `tempfile.SpooledTemporaryFile` lacks `seekable()`,
+    which zipfile needs to open archive members, so the in-memory or on-disk
+    file it wraps is used instead.
+
+    Args:
+        data_file (BinaryIO): The data file object.
+
+    Returns:
+        BinaryIO: A seekable file object at the same position.
+    """
+    if isinstance(data_file, tempfile.SpooledTemporaryFile):
+        return data_file._file
+    return data_file
+
+
+def _extract_zip(archive: Union[str, Path, BinaryIO], target_dir: Path, chunk_size: int = 1 << 20):
+    """
+    Extract a zip archive, streaming each member in large chunks.
+
+    Members with absolute paths or parent directory references are skipped,
+    as `shutil.unpack_archive` does.
+
+    Args:
+        archive (Union[str, Path, BinaryIO]): The path to the zip archive or
+            a seekable file object of it.
+        target_dir (Path): The directory to extract the archive to.
+        chunk_size (int, optional): The size of the chunks to copy the
+            members in. Defaults to 1 MiB.
+    """
+    target_dir = Path(target_dir)
+    with zipfile.ZipFile(archive) as zip_file:
+        for member in zip_file.infolist():
+            name = member.filename
+            if name.startswith("/") or ".." in name.split("/"):
+                continue
+            target_path = target_dir.joinpath(*name.split("/"))
+            if member.is_dir():
+                target_path.mkdir(parents=True, exist_ok=True)
+                continue
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            with zip_file.open(member) as src, open(target_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, length=chunk_size)
 
 
 def dump_requirements_file(
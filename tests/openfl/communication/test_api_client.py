@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 """Derector API's client tests module."""
 
+import gc
 import sys
 from unittest import mock
 
@@ -59,3 +60,82 @@ def test_get_best_model(deconstruct_model_proto, director_client,
     else:
         incoming_model_type = request.args[0].model_type
     assert incoming_model_type == getattr(director_pb2.GetTrainedModelRequest, model_type)
+
+
+@mock.patch('openfl.transport.grpc.director_client.director_pb2_grpc')
+def test_pooled_stubs_round_robin(director_pb2_grpc):
+    """Test that calls are spread over the pooled connections."""
+    stubs = [mock.Mock(), mock.Mock()]
+    director_pb2_grpc.DirectorStub.side_effect = stubs
+    director_client = DirectorClient(
+        director_host='localhost',
+        director_port=50051,
+        client_id='one',
+        tls=False,
+        root_certificate=None,
+        private_key=None,
+        certificate=None,
+        pool_size=2,
+    )
+    director_client.get_dataset_info()
+    director_client.get_dataset_info()
+
+    for stub in stubs:
+        stub.GetDatasetInfo.assert_called_once()
+
+
+def _shared_channel_client(client_id):
+    """Create a client of the director used by the shared channel tests."""
+    return DirectorClient(
+        director_host='shared-channel-host',
+        director_port=50051,
+        client_id=client_id,
+        tls=False,
+        root_certificate=None,
+        private_key=None,
+        certificate=None,
+    )
+
+
+@mock.patch('openfl.transport.grpc.director_client.grpc.insecure_channel')
+def test_clients_share_channels(insecure_channel):
+    """Test that clients of the same director share their channel."""
+    clients = [_shared_channel_client(client_id) for client_id in ('one', 'two')]
+
+    insecure_channel.assert_called_once()
+    for client in clients:
+        client.close()
+
+
+@mock.patch('openfl.transport.grpc.director_client.grpc.insecure_channel')
+def test_close_releases_shared_channels(insecure_channel):
+    """Test that a shared channel is closed once its last client is closed."""
+    channel = insecure_channel.return_value
+    first, second = _shared_channel_client('one'), _shared_channel_client('two')
+
+    first.close()
+    first.close()
+    channel.close.assert_not_called()
+    second.close()
+    channel.close.assert_called_once()
+
+    _shared_channel_client('three').close()
+    assert insecure_channel.call_count == 2
+
+
+@mock.patch('openfl.transport.grpc.director_client.grpc.insecure_channel')
+def test_collected_client_releases_shared_channels(insecure_channel):
+    """Test that a client that is never closed releases its channel when collected."""
+    client = _shared_channel_client('one')
+    del client
+    gc.collect()
+
+    insecure_channel.return_value.close.assert_called_once()
+
+
+def test_get_envoys_queries_director(director_client):
+    """Test that every envoy query gets the current list from the director."""
+    director_client.stub.GetEnvoys.return_value = director_pb2.GetEnvoysResponse()
+    director_client.get_envoys()
+    director_client.get_envoys(raw_result=True)
+    assert director_client.stub.GetEnvoys.call_count == 2
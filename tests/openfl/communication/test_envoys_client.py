@@ -52,3 +52,21 @@ def test_report_shard_info(director_client):
         resp = director_client.stub.UpdateShardInfo.call_args.args[0]
     assert resp.shard_info.shard_description == shard_descriptor.dataset_description
     assert resp.shard_info.sample_shape == shard_descriptor.sample_shape
+
+
+@mock.patch('openfl.transport.grpc.director_client.grpc.insecure_channel')
+def test_close(insecure_channel):
+    """Test that close closes the connections to the director."""
+    director_client = ShardDirectorClient(
+        director_host='fqdn',
+        director_port=50051,
+        shard_name='test shard',
+        tls=False,
+        root_certificate=None,
+        private_key=None,
+        certificate=None,
+    )
+
+    director_client.close()
+
+    insecure_channel.return_value.close.assert_called()
@@ -102,6 +102,16 @@ def test_all_quit_jobs_sent(agg, quit_job_sent_to, authorized_cols, expected):
     assert all_quit_jobs_sent == expected
 
 
+def test_quit_job_sent_callback(agg):
+    """Test that quit_job_sent_callback is called once every collaborator got a quit job."""
+    agg._time_to_quit = mock.Mock(return_value=True)
+    agg.quit_job_sent_callback = mock.Mock()
+    agg.get_tasks('col1')
+    agg.quit_job_sent_callback.assert_not_called()
+    agg.get_tasks('col2')
+    agg.quit_job_sent_callback.assert_called_once_with()
+
+
 def test_get_sleep_time(agg):
     """Test that get_sleep_time returns 10."""
     assert 10 == agg._get_sleep_time()
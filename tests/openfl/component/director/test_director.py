@@ -0,0 +1,133 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Director tests module."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest import mock
+
+import pytest
+
+from openfl.component.director.director import Director
+from openfl.component.director.experiment import Experiment, Status
+
+
+def _shard_info(name):
+    """Build a minimal shard info."""
+    return {
+        'node_info': {'name': name, 'cuda_devices': []},
+        'sample_shape': ['1'],
+        'target_shape': ['1'],
+    }
+
+
+@pytest.fixture
+def director():
+    """Initialize the director with a few registered envoys."""
+    director = Director(
+        tls=False, sample_shape=['1'], target_shape=['1'], envoy_health_check_period=10)
+    with mock.patch('openfl.component.director.director.time.monotonic', return_value=990.0):
+        for i in range(10):
+            envoy_name = f'envoy_{i}'
+            assert director.acknowledge_shard(_shard_info(envoy_name))
+            director.col_exp[envoy_name] = None
+    return director
+
+
+@mock.patch('openfl.component.director.director.time.time', return_value=5012.0)
+@mock.patch('openfl.component.director.director.time.monotonic')
+def test_get_envoys_marks_stale_envoys_offline(mock_monotonic, mock_time, director):
+    """Test that envoys missing their health checks are reported offline."""
+    mock_monotonic.return_value = 1000.0
+    director.update_envoy_status(envoy_name='envoy_3', is_experiment_running=True)
+
+    mock_monotonic.return_value = 1012.0
+    envoys = {info['shard_info']['node_info']['name']: info for info in director.get_envoys()}
+
+    assert len(envoys) == 10
+    assert envoys['envoy_3']['is_online']
+    assert envoys['envoy_3']['is_experiment_running']
+    assert envoys['envoy_3']['last_updated'] == 5000.0
+    assert not any(info['is_online'] for name, info in envoys.items() if name != 'envoy_3')
+
+
+def test_update_envoy_status_unknown_envoy(director):
+    """Test that the status of an unknown envoy is rejected."""
+    with pytest.raises(Exception, match='Unknown shard'):
+        director.update_envoy_status(envoy_name='unknown', is_experiment_running=False)
+
+
+def test_acknowledge_shard_reconnect(director):
+    """Test that a reconnecting envoy reuses its registry entry."""
+    envoy_info = director._shard_registry['envoy_0']
+    row = director._envoy_index['envoy_0']
+    director._envoy_online[row] = False
+
+    shard_info = _shard_info('envoy_0')
+    assert director.acknowledge_shard(shard_info)
+
+    assert director._shard_registry['envoy_0'] is envoy_info
+    assert envoy_info['shard_info'] is shard_info
+    assert director._envoy_index['envoy_0'] == row
+    assert director._envoy_online[row]
+    assert len(director._envoy_index) == 10
+
+
+def test_start_experiment_execution_loop_dispatch_buffers():
+    """Test that envoys are notified in buffers spaced by the dispatch interval."""
+    director = Director(tls=False, dispatch_buffer_size=2, dispatch_buffer_interval=3.0)
+    experiment = mock.Mock()
+    experiment.name = 'experiment'
+    experiment.collaborators = [f'envoy_{i}' for i in range(5)]
+    experiment.start = mock.AsyncMock()
+    notified = []
+
+    @asynccontextmanager
+    async def get_next_experiment():
+        if notified:
+            raise asyncio.CancelledError
+        yield experiment
+
+    async def sleep(delay):
+        notified.append((delay, list(director.col_exp_pending)))
+
+    director.experiments_registry = mock.Mock(get_next_experiment=get_next_experiment)
+    with mock.patch('openfl.component.director.director.asyncio.sleep', sleep):
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(director.start_experiment_execution_loop())
+
+    assert notified == [
+        (3.0, ['envoy_0', 'envoy_1']),
+        (3.0, ['envoy_0', 'envoy_1', 'envoy_2', 'envoy_3']),
+    ]
+    assert list(director.col_exp_pending) == experiment.collaborators
+    experiment.start.assert_awaited_once()
+
+
+@pytest.mark.parametrize('status,handed_back', [
+    (Status.IN_PROGRESS, True),
+    (Status.FAILED, False),
+])
+def test_wait_experiment_without_aggregator(director, tmp_path, status, handed_back):
+    """Test that only a starting experiment is handed back before its aggregator exists."""
+    async def wait_experiment():
+        experiment = Experiment(
+            name='experiment',
+            archive_path=tmp_path / 'experiment.zip',
+            collaborators=['envoy_0'],
+            sender='user',
+            init_tensor_dict={},
+        )
+        experiment.status = status
+        director.experiments_registry.add(experiment)
+        director.col_exp['envoy_0'] = experiment.name
+        waiting = asyncio.ensure_future(director.wait_experiment('envoy_0'))
+        await asyncio.sleep(0)
+        if not waiting.done():
+            waiting.cancel()
+            return None
+        return waiting.result()
+
+    experiment_name = asyncio.run(wait_experiment())
+
+    assert (experiment_name == 'experiment') is handed_back
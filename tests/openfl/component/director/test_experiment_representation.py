@@ -2,6 +2,9 @@
 # SPDX-License-Identifier: Apache-2.0
 """Experiment representation class tests module."""
 
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest import mock
 
@@ -48,3 +51,39 @@ async def test_review_experiment(
     )
     assert experiment_rep.archive_path.unlink.call_count == archive_unlink_call_count
     assert experiment_rep.status == experiment_status
+
+
+@pytest.mark.asyncio
+async def test_run_aggregator_grpc_server_quit_jobs_sent():
+    """Test that the aggregator server stops once quit jobs are sent."""
+    aggregator_grpc_server = mock.Mock()
+    run_atask = asyncio.ensure_future(
+        Experiment._run_aggregator_grpc_server(aggregator_grpc_server))
+    await asyncio.sleep(0.1)
+    aggregator = aggregator_grpc_server.aggregator
+    # The aggregator notifies the director from a gRPC worker thread
+    threading.Thread(target=aggregator.quit_job_sent_callback).start()
+    await asyncio.wait_for(run_atask, 1)
+
+    aggregator_grpc_server.get_server.return_value.stop.assert_called_once_with(0)
+    assert aggregator.quit_job_sent_callback is None
+
+
+@pytest.mark.asyncio
+async def test_run_aggregator_grpc_server_cancelled():
+    """Test that a cancelled experiment holds no executor thread."""
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        loop.set_default_executor(executor)
+        aggregator_grpc_server = mock.Mock()
+        run_atask = asyncio.ensure_future(
+            Experiment._run_aggregator_grpc_server(aggregator_grpc_server))
+        await asyncio.sleep(0.1)
+        # The only executor thread stays free while the experiment is running
+        await asyncio.wait_for(loop.run_in_executor(None, int), 1)
+
+        run_atask.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run_atask
+    aggregator_grpc_server.get_server.return_value.stop.assert_called_once_with(0)
+    assert aggregator_grpc_server.aggregator.quit_job_sent_callback is None
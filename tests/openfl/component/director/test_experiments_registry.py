@@ -0,0 +1,96 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Experiments registry tests module."""
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+from openfl.component.director.experiment import ExperimentsRegistry
+
+
+def _experiment(name, users=('test_user',)):
+    """Build a minimal experiment mock."""
+    experiment = mock.Mock()
+    experiment.name = name
+    experiment.users = set(users)
+    return experiment
+
+
+@pytest.mark.asyncio
+async def test_get_next_experiment_wakes_on_add():
+    """Test that a waiting get_next_experiment is woken up by add."""
+    registry = ExperimentsRegistry()
+
+    async def next_experiment_name():
+        async with registry.get_next_experiment() as experiment:
+            return experiment.name
+
+    task = asyncio.create_task(next_experiment_name())
+    await asyncio.sleep(0)
+    assert not task.done()
+
+    registry.add(_experiment('test_exp'))
+    assert await asyncio.wait_for(task, timeout=1) == 'test_exp'
+    assert registry.active_experiment is None
+    assert not registry.pending_experiments
+
+
+def test_remove():
+    """Test that remove drops the experiment from the queue and the archive."""
+    registry = ExperimentsRegistry()
+    for name in ('exp1', 'exp2', 'exp3'):
+        registry.add(_experiment(name))
+
+    registry.remove('exp2')
+
+    assert 'exp2' not in registry
+    assert list(registry.pending_experiments) == ['exp1', 'exp3']
+    registry.remove('unknown')
+    assert list(registry.pending_experiments) == ['exp1', 'exp3']
+
+
+@pytest.mark.asyncio
+async def test_remove_archived():
+    """Test that an archived experiment can be removed and submitted again."""
+    registry = ExperimentsRegistry()
+    registry.add(_experiment('exp1'))
+    async with registry.get_next_experiment():
+        pass
+
+    registry.remove('exp1')
+    registry.add(_experiment('exp1'))
+
+    assert list(registry.pending_experiments) == ['exp1']
+
+
+def test_get_user_experiments():
+    """Test that get_user_experiments returns only the user's experiments."""
+    registry = ExperimentsRegistry()
+    exp1 = _experiment('exp1', users=('user1',))
+    exp2 = _experiment('exp2', users=('user1', 'user2'))
+    registry.add(exp1)
+    registry.add(exp2)
+
+    assert registry.get_user_experiments('user1') == [exp1, exp2]
+    assert registry.get_user_experiments('user2') == [exp2]
+    assert registry.get_user_experiments('user3') == []
+
+    registry.remove('exp2')
+    assert registry.get_user_experiments('user1') == [exp1]
+    assert registry.get_user_experiments('user2') == []
+
+
+@pytest.mark.asyncio
+async def test_archive_evicts_oldest():
+    """Test that the oldest finished experiments are dropped from the registry."""
+    registry = ExperimentsRegistry(max_archived_experiments=2)
+    for name in ('exp1', 'exp2', 'exp3'):
+        registry.add(_experiment(name))
+        async with registry.get_next_experiment():
+            pass
+
+    assert 'exp1' not in registry
+    assert 'exp2' in registry and 'exp3' in registry
+    assert [exp.name for exp in registry.get_user_experiments('test_user')] == ['exp2', 'exp3']
@@ -0,0 +1,97 @@
+# Copyright (C) 2020-2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Envoy tests module."""
+
+import os
+from unittest import mock
+
+import pytest
+
+from openfl.component.envoy import envoy
+from openfl.component.envoy.envoy import Envoy
+from openfl.protocols import director_pb2
+
+CHUNKS = [bytes([i]) * 1000 for i in range(40)]
+DATA = b''.join(CHUNKS)
+
+
+def _data_stream(chunks=CHUNKS):
+    """Build the experiment data stream of the chunks."""
+    return [director_pb2.ExperimentData(size=len(chunk), npbytes=chunk) for chunk in chunks]
+
+
+@pytest.mark.parametrize('data_size', [len(DATA), None])
+def test_save_data_stream_in_memory(data_size):
+    """Test that a small archive is kept in memory."""
+    data_file = Envoy._save_data_stream_to_file(_data_stream(), data_size)
+
+    assert not data_file._rolled
+    data_file.seek(0)
+    assert data_file.read() == DATA
+    data_file.close()
+
+
+@mock.patch.object(envoy, 'MAX_IN_MEMORY_DATA_FILE_SIZE', 1024)
+@mock.patch.object(envoy.os, 'posix_fallocate', create=True)
+@mock.patch.object(envoy.os, 'writev', wraps=getattr(os, 'writev', None), create=True)
+def test_save_data_stream_on_disk(writev, posix_fallocate):
+    """Test that a large archive is preallocated on disk and written in batches."""
+    data_file = Envoy._save_data_stream_to_file(_data_stream(), len(DATA))
+
+    assert data_file._rolled
+    posix_fallocate.assert_called_once_with(data_file.fileno(), 0, len(DATA))
+    batch_size = envoy.DATA_FILE_WRITE_BATCH_SIZE
+    assert writev.call_count == (len(CHUNKS) + batch_size - 1) // batch_size
+    data_file.seek(0)
+    assert data_file.read() == DATA
+    data_file.close()
+
+
+@mock.patch.object(envoy, 'MAX_IN_MEMORY_DATA_FILE_SIZE', 1024)
+def test_save_data_stream_on_disk_without_writev():
+    """Test that a large archive is written chunk by chunk without vectored writes."""
+    with mock.patch.object(envoy, 'os', wraps=os) as envoy_os:
+        del envoy_os.writev
+        data_file = Envoy._save_data_stream_to_file(_data_stream(), len(DATA))
+
+    assert data_file._rolled
+    data_file.seek(0)
+    assert data_file.read() == DATA
+    data_file.close()
+
+
+def test_save_data_stream_chunk_size_mismatch():
+    """Test that a chunk which does not match its size is rejected."""
+    data_stream = _data_stream()
+    data_stream[1].size += 1
+
+    with pytest.raises(Exception, match='Broken archive'):
+        Envoy._save_data_stream_to_file(data_stream, len(DATA))
+
+
+@pytest.mark.parametrize('max_in_memory_size', [len(DATA) * 2, 1024])
+def test_save_data_stream_total_size_mismatch(max_in_memory_size):
+    """Test that an archive which does not match the announced size is rejected."""
+    with mock.patch.object(envoy, 'MAX_IN_MEMORY_DATA_FILE_SIZE', max_in_memory_size):
+        with pytest.raises(Exception, match='Broken archive'):
+            Envoy._save_data_stream_to_file(_data_stream(CHUNKS[:-1]), len(DATA))
+
+
+@pytest.mark.parametrize('period,expected_wait', [
+    (24 * 60 * 60, 24 * 60 * 60),
+    (0, envoy.MIN_HEALTH_CHECK_PERIOD_IN_SECONDS),
+])
+def test_send_health_check_period(period, expected_wait):
+    """Test that the envoy waits the health check period set by the director."""
+    envoy_node = Envoy.__new__(Envoy)
+    envoy_node.name = 'envoy'
+    envoy_node.is_experiment_running = False
+    envoy_node.cuda_device_monitor = None
+    envoy_node.director_client = mock.Mock()
+    envoy_node.director_client.send_health_check.return_value = period
+    envoy_node._shutdown_event = mock.Mock()
+    envoy_node._shutdown_event.is_set.side_effect = [False, True]
+
+    envoy_node.send_health_check()
+
+    envoy_node._shutdown_event.wait.assert_called_once_with(expected_wait)
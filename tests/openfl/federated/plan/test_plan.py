@@ -2,14 +2,14 @@
 # SPDX-License-Identifier: Apache-2.0
 """Plan API's tests module."""
 
+from pathlib import Path
 from unittest import mock
 
 import pytest
-from pathlib import Path
 
-from openfl.federated.plan.plan import Plan
-from openfl.component.assigner import RandomGroupedAssigner
 from openfl.component.aggregator import Aggregator
+from openfl.component.assigner import RandomGroupedAssigner
+from openfl.federated.plan.plan import Plan
 
 
 @pytest.fixture
@@ -47,3 +47,16 @@ def test_get_aggregator(mocker, plan):
     mocker.patch('openfl.protocols.utils.load_proto', mock.Mock())
     Aggregator._load_initial_tensors = mock.Mock()
     assert isinstance(plan.get_aggregator(), Aggregator)
+
+
+def test_parse_cached():
+    """Test that parse_cached reuses the parse but returns independent copies."""
+    plan_path = Path(__file__).parent / 'plan_example.yaml'
+    with mock.patch.object(Plan, 'parse', wraps=Plan.parse) as parse:
+        plan1 = Plan.parse_cached(plan_path)
+        plan1.config['aggregator']['settings']['rounds_to_train'] = -1
+        plan2 = Plan.parse_cached(plan_path)
+
+    assert parse.call_count <= 1
+    assert plan1 is not plan2
+    assert plan2.config['aggregator']['settings']['rounds_to_train'] != -1
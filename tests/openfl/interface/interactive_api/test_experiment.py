@@ -6,10 +6,8 @@ from unittest import mock
 
 import pytest
 
-from openfl.component.assigner.tasks import TrainTask
-from openfl.component.assigner.tasks import ValidateTask
-from openfl.interface.interactive_api.experiment import FLExperiment
-from openfl.interface.interactive_api.experiment import TaskKeeper
+from openfl.component.assigner.tasks import TrainTask, ValidateTask
+from openfl.interface.interactive_api.experiment import FLExperiment, TaskKeeper
 
 
 @pytest.fixture()
@@ -95,3 +93,41 @@ def test_define_task_assigner_exception_no_tasks():
     rounds_to_train = 1
     with pytest.raises(Exception):
         FLExperiment(None).define_task_assigner(task_keeper, rounds_to_train)
+
+
+def test_remove_workspace_archive(tmp_path):
+    """Test that the returned thread removes the workspace archive."""
+    experiment = FLExperiment(None)
+    experiment.arch_path = str(tmp_path / 'workspace.zip')
+    (tmp_path / 'workspace.zip').write_bytes(b'archive')
+
+    removal = experiment.remove_workspace_archive()
+    removal.join()
+
+    assert not (tmp_path / 'workspace.zip').exists()
+    assert not hasattr(experiment, 'arch_path')
+
+
+def test_remove_workspace_archive_missing(tmp_path, caplog):
+    """Test that a failing removal is logged instead of lost in the thread."""
+    experiment = FLExperiment(None)
+    experiment.arch_path = str(tmp_path / 'workspace.zip')
+
+    experiment.remove_workspace_archive().join()
+
+    assert 'Could not remove' in caplog.text
+
+
+def test_prepare_workspace_distribution_waits_for_removal():
+    """Test that a new archive is only packed once the old one is removed."""
+    experiment = FLExperiment(None)
+    experiment._archive_removal = mock.Mock()
+    experiment._serialize_interface_objects = mock.Mock()
+    experiment._pack_the_workspace = mock.Mock(return_value='workspace.zip')
+    removal = experiment._archive_removal
+    with mock.patch('openfl.interface.interactive_api.experiment.Plan.dump'), \
+            mock.patch('openfl.interface.interactive_api.experiment.dump_requirements_file'):
+        experiment.prepare_workspace_distribution(None, None, None, None)
+
+    removal.join.assert_called_once_with()
+    assert experiment.arch_path == 'workspace.zip'
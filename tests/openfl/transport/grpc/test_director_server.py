@@ -2,13 +2,21 @@
 # SPDX-License-Identifier: Apache-2.0
 """Director tests module."""
 
+import asyncio
+import hashlib
+import os
+import threading
 from pathlib import Path
 from unittest import mock
 
 import pytest
 
 from openfl.component.director import Director
+from openfl.protocols import director_pb2
 from openfl.transport import DirectorGRPCServer
+from openfl.transport.grpc import director_server as director_server_module
+from openfl.transport.grpc.director_server import MAX_EXPERIMENT_DATA_CHUNK_SIZE, _is_compressed
+from openfl.transport.grpc.grpc_channel_options import max_message_length
 
 
 @pytest.fixture
@@ -77,3 +85,226 @@ def test_get_sender_no_tls_no_client_id(insecure_director):
     default_client_id = '__default__'
     result = insecure_director.get_caller(context)
     assert result == default_client_id
+
+
+def _register_envoy(director_server, envoy_name):
+    """Register an envoy with the director."""
+    shard_request = director_pb2.UpdateShardInfoRequest()
+    shard_request.shard_info.node_info.name = envoy_name
+    shard_request.shard_info.sample_shape.append('1')
+    shard_request.shard_info.target_shape.append('1')
+    response = asyncio.run(director_server.UpdateShardInfo(shard_request, mock.Mock()))
+    assert response.accepted
+    director_server.director.col_exp[envoy_name] = None
+
+
+@pytest.fixture
+def envoys_director():
+    """Initialize an insecure director with a registered envoy."""
+    director_server = DirectorGRPCServer(
+        director_cls=Director, tls=False, sample_shape=['1'], target_shape=['1'],
+        envoy_health_check_period=60)
+    _register_envoy(director_server, 'envoy_0')
+    return director_server
+
+
+def test_get_envoys_response_reused(envoys_director):
+    """Test that GetEnvoys responses are reused until an envoy registers."""
+    request, context = mock.Mock(), mock.Mock()
+    first = asyncio.run(envoys_director.GetEnvoys(request, context))
+    second = asyncio.run(envoys_director.GetEnvoys(request, context))
+    assert first is second
+
+    _register_envoy(envoys_director, 'envoy_1')
+    third = asyncio.run(envoys_director.GetEnvoys(request, context))
+    assert len(third.envoy_infos) == 2
+
+
+def test_get_envoys_after_update_envoy_status(envoys_director):
+    """Test that GetEnvoys reflects a health check reported right before."""
+    request, context = mock.Mock(), mock.Mock()
+    response = asyncio.run(envoys_director.GetEnvoys(request, context))
+    assert not response.envoy_infos[0].is_experiment_running
+
+    status_request = director_pb2.UpdateEnvoyStatusRequest(
+        name='envoy_0', is_experiment_running=True)
+    asyncio.run(envoys_director.UpdateEnvoyStatus(status_request, context))
+    response = asyncio.run(envoys_director.GetEnvoys(request, context))
+    assert response.envoy_infos[0].is_online
+    assert response.envoy_infos[0].is_experiment_running
+
+
+def test_get_envoys_after_missed_health_checks(envoys_director):
+    """Test that GetEnvoys reports an envoy offline once its checks are missed."""
+    request, context = mock.Mock(), mock.Mock()
+    assert asyncio.run(envoys_director.GetEnvoys(request, context)).envoy_infos[0].is_online
+
+    monotonic = envoys_director.director._envoy_last_updated[0] + 121
+    with mock.patch(
+            'openfl.component.director.director.time.monotonic', return_value=monotonic):
+        response = asyncio.run(envoys_director.GetEnvoys(request, context))
+    assert not response.envoy_infos[0].is_online
+
+
+def test_set_new_experiment_size_mismatch(tmp_path):
+    """Test that a corrupted upload is aborted and its partial archive removed."""
+    director_server = DirectorGRPCServer(director_cls=Director, tls=False)
+    director_server.root_dir = tmp_path
+
+    async def stream():
+        yield director_pb2.ExperimentInfo(
+            experiment_data=director_pb2.ExperimentData(size=3, npbytes=b'abc'))
+        yield director_pb2.ExperimentInfo(
+            experiment_data=director_pb2.ExperimentData(size=3, npbytes=b'ab'))
+
+    context = mock.Mock()
+    context.abort = mock.AsyncMock(side_effect=Exception('aborted'))
+    with pytest.raises(Exception, match='aborted'):
+        asyncio.run(director_server.SetNewExperiment(stream(), context))
+    context.abort.assert_awaited_once()
+    assert not list(tmp_path.iterdir())
+
+
+def test_get_experiment_data_chunk_growth(tmp_path):
+    """Test that experiment data chunks grow up to the configured size."""
+    data_file_path = tmp_path / 'experiment.zip'
+    data_file_path.write_bytes(b'x' * 1024 * 1024)
+    director_server = DirectorGRPCServer(
+        director_cls=Director, tls=False, experiment_data_chunk_size=256 * 1024)
+    chunk_sizes = []
+
+    async def write(reply):
+        chunk_sizes.append(reply.size)
+
+    context = mock.Mock()
+    context.send_initial_metadata = mock.AsyncMock()
+    context.write = write
+    with mock.patch.object(
+            director_server.director, 'get_experiment_data', return_value=data_file_path):
+        asyncio.run(director_server.GetExperimentData(mock.Mock(), context))
+
+    # The next chunk is read ahead while the current one is written
+    assert chunk_sizes[:4] == [64 * 1024, 64 * 1024, 128 * 1024, 256 * 1024]
+    assert max(chunk_sizes) == 256 * 1024
+    assert sum(chunk_sizes) == 1024 * 1024
+
+
+@pytest.mark.parametrize('content,gzipped', [
+    (b'PK\x03\x04archive', False),
+    (b'plain archive', True),
+])
+def test_get_experiment_data_head(tmp_path, content, gzipped):
+    """Test that the archive is opened off the event loop and sent with its size."""
+    data_file_path = tmp_path / 'experiment.zip'
+    data_file_path.write_bytes(content)
+    director_server = DirectorGRPCServer(director_cls=Director, tls=False)
+    open_threads = []
+    open_with_size = director_server_module._open_with_size
+
+    def record_open(path):
+        open_threads.append(threading.current_thread())
+        return open_with_size(path)
+
+    context = mock.Mock()
+    context.send_initial_metadata = mock.AsyncMock()
+    context.write = mock.AsyncMock()
+    with mock.patch.object(
+            director_server.director, 'get_experiment_data', return_value=data_file_path):
+        with mock.patch.object(director_server_module, '_open_with_size', record_open):
+            asyncio.run(director_server.GetExperimentData(mock.Mock(), context))
+
+    assert open_threads and threading.main_thread() not in open_threads
+    assert context.set_compression.called is gzipped
+    context.send_initial_metadata.assert_awaited_once_with(
+        (('experiment-data-size', str(len(content))),))
+    assert context.write.await_args.args[0].npbytes == content
+
+
+@pytest.mark.parametrize('content,compressed', [
+    (b'PK\x03\x04archive', True),
+    (b'\x1f\x8barchive', True),
+    (b'plain archive', False),
+    (b'', False),
+])
+def test_is_compressed(content, compressed):
+    """Test that compressed archives are told apart by their signature."""
+    assert _is_compressed(content) is compressed
+
+
+def test_set_new_experiment_digest(tmp_path):
+    """Test that the digest of the received archive is sent back."""
+    director_server = DirectorGRPCServer(director_cls=Director, tls=False)
+    director_server.root_dir = tmp_path
+
+    async def stream():
+        for chunk in (b'experiment ', b'archive'):
+            yield director_pb2.ExperimentInfo(
+                name='exp',
+                experiment_data=director_pb2.ExperimentData(size=len(chunk), npbytes=chunk))
+
+    context = mock.Mock()
+    context.invocation_metadata.return_value = ()
+    with mock.patch.object(
+            director_server.director, 'set_new_experiment', mock.AsyncMock(return_value=True)):
+        response = asyncio.run(director_server.SetNewExperiment(stream(), context))
+
+    assert response.accepted
+    assert response.digest == hashlib.sha256(b'experiment archive').digest()
+
+
+def test_set_new_experiment_cancelled_during_write(tmp_path):
+    """Test that a cancelled upload removes its archive only after the write in flight."""
+    director_server = DirectorGRPCServer(director_cls=Director, tls=False)
+    director_server.root_dir = tmp_path
+    write_started, release_write = threading.Event(), threading.Event()
+    events = []
+    fdopen = os.fdopen
+
+    class SlowFile:
+        def __init__(self, fd, mode):
+            self.file = fdopen(fd, mode)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            events.append('close')
+            self.file.close()
+
+        def write(self, data):
+            write_started.set()
+            release_write.wait()
+            self.file.write(data)
+            events.append('write')
+
+    async def stream():
+        yield director_pb2.ExperimentInfo(
+            experiment_data=director_pb2.ExperimentData(size=3, npbytes=b'abc'))
+        await asyncio.Event().wait()
+
+    async def cancel_during_write():
+        task = asyncio.ensure_future(director_server.SetNewExperiment(stream(), mock.Mock()))
+        await asyncio.get_running_loop().run_in_executor(None, write_started.wait)
+        try:
+            for _ in range(2):
+                task.cancel()
+                await asyncio.sleep(0.05)
+            assert not task.done()
+        finally:
+            release_write.set()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with mock.patch('openfl.transport.grpc.director_server.os.fdopen', SlowFile):
+        asyncio.run(cancel_during_write())
+
+    assert events == ['write', 'close']
+    assert not list(tmp_path.iterdir())
+
+
+def test_max_experiment_data_chunk_fits_message():
+    """Test that the largest experiment data chunk fits in a gRPC message."""
+    size = MAX_EXPERIMENT_DATA_CHUNK_SIZE
+    reply = director_pb2.ExperimentData(size=size, npbytes=bytes(size))
+
+    assert reply.ByteSize() < max_message_length
@@ -0,0 +1,63 @@
+# Copyright (C) 2020-2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Experiment workspace test module."""
+
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from openfl.utilities.workspace import ExperimentWorkspace
+
+FILES = {'plan/plan.yaml': b'settings: {}\n', 'src/model.py': b'MODEL = 1\n'}
+
+
+def _write_archive(data_file):
+    """Write a zip archive of FILES to the file object."""
+    with zipfile.ZipFile(data_file, 'w') as zip_file:
+        for name, content in FILES.items():
+            zip_file.writestr(name, content)
+
+
+@pytest.fixture
+def spooled_seekable_removed():
+    """Make SpooledTemporaryFile lack seekable() as it does before Python 3.11."""
+    def seekable(_):
+        raise AttributeError('seekable')
+
+    with mock.patch.object(
+            tempfile.SpooledTemporaryFile, 'seekable', property(seekable), create=True):
+        yield
+
+
+@pytest.mark.parametrize('rolled', [False, True])
+def test_workspace_from_spooled_data_file(
+        tmp_path, monkeypatch, spooled_seekable_removed, rolled):
+    """Test that an archive received in a spooled temporary file is extracted."""
+    monkeypatch.chdir(tmp_path)
+    data_file = tempfile.SpooledTemporaryFile(max_size=1 << 20)
+    _write_archive(data_file)
+    if rolled:
+        data_file.rollover()
+
+    with ExperimentWorkspace('experiment', data_file=data_file):
+        for name, content in FILES.items():
+            assert Path(name).read_bytes() == content
+
+    assert data_file.closed
+    assert not (tmp_path / 'experiment').exists()
+
+
+def test_workspace_from_data_file_path(tmp_path, monkeypatch):
+    """Test that an archive on disk is extracted and removed afterwards."""
+    monkeypatch.chdir(tmp_path)
+    data_file_path = tmp_path / 'experiment.zip'
+    _write_archive(data_file_path)
+
+    with ExperimentWorkspace('experiment', data_file_path=data_file_path):
+        for name, content in FILES.items():
+            assert Path(name).read_bytes() == content
+
+    assert not data_file_path.exists()